@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+A least recently used cache with hit and miss statistics.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A mapping of at most maxsize items, which drops the least recently used
+    item when a new one is added to a full cache.
+    """
+
+    def __init__(self, maxsize=4096):
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Returns the value for a key and marks it as the most recently used,
+        or returns default if the key is not in the cache.
+        """
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Add or replace the value for a key"""
+        self._data.pop(key, None)
+        self._data[key] = value
+        self._evict()
+
+    def maxsize(self, size=None):
+        """
+        Takes one argument as the new maximum number of items. Without an
+        argument, returns the current maximum.
+        """
+        if size is None:
+            return self._maxsize
+        self._maxsize = size
+        self._evict()
+
+    def _evict(self):
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop every item and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Returns a dict of the hits, misses, current size and maximum size of
+        the cache.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self._maxsize,
+        }
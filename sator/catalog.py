@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Catalogs of the set-classes of a modulus.
+
+A SetClassCatalog is built once for a modulus, canonical operators and
+default m from the prime forms given by sator.tables. It holds a column of
+each property of the set-classes (in prime order), and an index from each
+value of a property to the set-classes that have it, so that queries take
+time in proportion to the number of results rather than walking every
+set-class:
+
+    classes = catalog.get(12)
+    list(classes.each_int(card=6, ds=2))
+    for each in classes.each_set(icv=[4, 1, 1, 1, 1, 1, 1]):
+        print(each)
+"""
+
+import sator.utils as utils
+import sator.tables as tables
+
+# Force Python 2.X to use xrange
+try:
+    range = xrange
+except:
+    pass
+
+# The columns of a catalog, which are also its query keywords
+COLUMNS = ('card', 'icv', 'name', 'ds', 'invariance_vector', 'complement',
+           'mpartner')
+
+_catalogs = {}
+
+
+def get(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns the shared SetClassCatalog for a modulus, canonical operators
+    (T, I, M) and default m in the current ordering (see
+    sator.tables.ordering), building it on first use.
+    """
+    key = tables._cache_key(mod, canon, default_m)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = SetClassCatalog(*key[:3])
+    return catalog
+
+
+def clear():
+    """Drop every catalog that has been built."""
+    _catalogs.clear()
+
+
+class SetClassCatalog(object):
+    """
+    The set-classes of a modulus for the given canonical operators (T, I, M)
+    and default m, in the ordering of prime forms that is current when it is
+    built, with a column and an index for each of COLUMNS:
+
+        card - the cardinality
+        icv - the interval class vector, as a tuple
+        name - the Forte name (see SetBase.forte)
+        ds - the degree of symmetry (see SetBase.ds)
+        invariance_vector - the (n, m) pairs of the TTO's for which the
+            prime form is invariant, as a tuple (see SetBase.invariance_vector)
+        complement - the prime form of the abstract complement, as an int
+        mpartner - the prime form of the M-partner, as an int
+    """
+
+    class InvalidQuery(Exception):
+        pass
+
+    def __init__(self, mod=12, canon=(True, True, False), default_m=5):
+        self.mod, self.canon, self.default_m, self.ordering = \
+            tables._cache_key(mod, canon, default_m)
+        self.primes = tables.prime_ints(self.mod, self.canon, self.default_m)
+        self._rows = dict([(prime, row) for row, prime \
+                           in enumerate(self.primes)])
+        self.columns = dict([(column, []) for column in COLUMNS])
+        for prime in self.primes:
+            for column, value in zip(COLUMNS, self._properties(prime)):
+                self.columns[column].append(value)
+        self.indexes = {}
+        for column in COLUMNS:
+            index = self.indexes[column] = {}
+            for row, value in enumerate(self.columns[column]):
+                index.setdefault(value, []).append(row)
+
+    def __len__(self):
+        return len(self.primes)
+
+    def __contains__(self, integer):
+        return integer in self._rows
+
+    def __repr__(self):
+        return 'SetClassCatalog(mod={0}, canon={1}, default_m={2}, ' \
+            'ordering={3!r})'.format(self.mod, self.canon, self.default_m,
+                                     self.ordering)
+
+    def _prime(self, pcs):
+        """
+        Returns the integer representation of the prime form of a set, given
+        as an integer representation, a sator object or a list of pc's.
+        """
+        if isinstance(pcs, int):
+            integer = pcs
+        elif hasattr(pcs, 'setint'):
+            integer = pcs.setint
+        else:
+            integer = utils.setint(set([pc % self.mod for pc in pcs]))
+        return tables.prime_form(integer, self.mod, self.canon,
+                                 self.default_m)[0]
+
+    def _properties(self, prime):
+        """
+        Returns the value of each of COLUMNS for the set-class of a prime form,
+        given as an integer.
+        """
+        mod = self.mod
+        # Map each Tn of the prime to the n's that reach it, so that the n's
+        # of the invariant TnMm are found with one multiplication per m.
+        rotations = {}
+        for n in range(0, mod):
+            rotations.setdefault(utils.rotate(prime, n, mod), []).append(n)
+        invariance_vector = []
+        for m in (1, -1, self.default_m, mod - self.default_m):
+            multiplied = utils.multiply_int(prime, m, mod)
+            ns = sorted([-n % mod for n in rotations.get(multiplied, ())])
+            invariance_vector.extend([(n, m) for n in ns])
+        ds = len(rotations[prime]) + \
+            len(rotations.get(utils.multiply_int(prime, -1, mod), ()))
+        if mod == 12:
+            # Forte's names are keyed by the lowest integer of each class
+            name = utils.forte_name(tables.prime_form(
+                prime, mod, self.canon, self.default_m, 'setint')[0])
+        else:
+            name = tables.forte_name(prime, mod, self.canon, self.default_m)
+        return (utils.popcount(prime), tuple(utils.icv_int(prime, mod)),
+                name, ds, tuple(invariance_vector),
+                self._prime(~prime & (2 ** mod - 1)),
+                self._prime(utils.multiply_int(prime, self.default_m, mod)))
+
+    def _rows_of(self, query):
+        """
+        Yields the rows of the set-classes matching a dict of columns to
+        values. Only the rows of the smallest index are checked against the
+        other columns.
+        """
+        for column in query:
+            if column not in COLUMNS:
+                msg = '{0} is not a column of a catalog'.format(column)
+                raise self.InvalidQuery(msg)
+        if not query:
+            return iter(range(0, len(self.primes)))
+        candidates = [(len(self.indexes[column].get(value, ())), column) \
+                      for column, value in query.items()]
+        column = min(candidates)[1]
+        rows = self.indexes[column].get(query[column], ())
+        others = [(self.columns[each], value) \
+                  for each, value in query.items() if each != column]
+        return (row for row in rows \
+                if all([values[row] == value for values, value in others]))
+
+    def _query(self, kwargs):
+        """
+        Returns a dict of columns to values from query keywords, given with
+        any sequence for icv and invariance_vector, and any set in the
+        set-class for complement and mpartner.
+        """
+        query = dict([(column, value) for column, value in kwargs.items() \
+                      if value is not None])
+        for column in ('icv', 'invariance_vector'):
+            if column in query:
+                query[column] = tuple([tuple(value) if column != 'icv' \
+                                       else value for value in query[column]])
+        for column in ('complement', 'mpartner'):
+            if column in query:
+                query[column] = self._prime(query[column])
+        return query
+
+    def each_int(self, **kwargs):
+        """
+        Yields the integer representation of the prime form of each set-class
+        matching the keyword arguments, which are any of COLUMNS, in prime
+        order. Without arguments, yields every set-class.
+        Ex:
+            catalog.each_int(card=7, ds=2)
+        """
+        primes = self.primes
+        return (primes[row] for row in self._rows_of(self._query(kwargs)))
+
+    def each_set(self, **kwargs):
+        """
+        Same as each_int(), but yields PCSets in the modulus of the catalog,
+        with its canonical operators and default m. Yields shared
+        FrozenPCSets when the pool is enabled (see sator.pool).
+        """
+        from sator.pcset import PCSet
+        return PCSet._each_int_in_mod(self.each_int(**kwargs), self.mod,
+                                      self.canon, self.default_m)
+
+    def count(self, **kwargs):
+        """Returns the number of set-classes matching the keyword arguments."""
+        query = self._query(kwargs)
+        if len(query) == 1:
+            column, value = list(query.items())[0]
+            if column in self.indexes:
+                return len(self.indexes[column].get(value, ()))
+        return len(list(self._rows_of(query)))
+
+    def row(self, integer):
+        """
+        Returns a dict of the value of each of COLUMNS for the set-class of
+        a set (given as for complement and mpartner in queries), and its
+        prime form as 'prime'.
+        """
+        prime = self._prime(integer)
+        row = self._rows[prime]
+        result = dict([(column, self.columns[column][row]) \
+                       for column in COLUMNS])
+        result['prime'] = prime
+        return result
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 
 import sator.utils as utils
+from sator.groups import prime_counts
+from sator.catalog import SetClassCatalog
 
 from sator.tonerow import ToneRow
 from sator.pset import PSet
 from sator.pcset import PCSet
+from sator.frozen import FrozenToneRow, FrozenPSet, FrozenPCSet
 
 
 class InvalidTTO(Exception):
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Export set-class catalogs to an SQLite database and query them.
+
+export() writes the columns of the SetClassCatalog of each modulus (see
+sator.catalog) to a table named set_classes, so that batch jobs can share
+one file rather than each finding prime forms and their properties:
+
+    from sator import database
+    database.export('classes.db', range(5, 17))
+    database.query('classes.db', 'card = 7 AND ds >= 2 AND ic6 = 0')
+
+The table has one row per set-class, or per set with every_set=True, with
+the columns:
+
+    mod, canon (e.g. 'TI'), default_m, ordering - the catalog of the row
+    setint, prime - the integer representations of the set and its prime form
+    card, name, ds, complement, mpartner - as in SetClassCatalog
+    icv, invariance_vector - the JSON of the lists
+    ic0, ic1, ... - each entry of the ICV (NULL beyond the ICV of a modulus)
+
+Each column has an index. SetBase.each_prime_in_database() yields the
+results of a query as PCSets.
+"""
+
+import json
+import sqlite3
+
+import sator.tables as tables
+import sator.catalog as catalog
+
+# Force Python 2.X to use xrange
+try:
+    range = xrange
+except:
+    pass
+
+TABLE = 'set_classes'
+COLUMNS = (('mod', 'INTEGER'), ('canon', 'TEXT'), ('default_m', 'INTEGER'),
+           ('ordering', 'TEXT'),
+           ('setint', 'INTEGER'), ('prime', 'INTEGER'), ('card', 'INTEGER'),
+           ('icv', 'TEXT'), ('name', 'TEXT'), ('ds', 'INTEGER'),
+           ('invariance_vector', 'TEXT'), ('complement', 'INTEGER'),
+           ('mpartner', 'INTEGER'))
+
+
+def _canon_letters(canon):
+    return ''.join([letter for letter, value in zip('TIM', canon) \
+                    if value]) or 'none'
+
+
+def _ic_columns(connection):
+    """Returns the names of the ic columns of the table, in order."""
+    names = [row[1] for row in connection.execute(
+        'PRAGMA table_info({0})'.format(TABLE))]
+    return [name for name in names if name.startswith('ic') \
+            and name[2:].isdigit()]
+
+
+def _create(connection, mod):
+    """
+    Creates the table and its indexes if needed, with an ic column for each
+    entry of the ICV in the modulus.
+    """
+    columns = ', '.join(['{0} {1}'.format(*column) for column in COLUMNS])
+    connection.execute('CREATE TABLE IF NOT EXISTS {0} ({1})'.format(
+        TABLE, columns))
+    names = [name for name, _ in COLUMNS]
+    existing = _ic_columns(connection)
+    for ic in range(len(existing), mod // 2 + 1):
+        name = 'ic{0}'.format(ic)
+        connection.execute('ALTER TABLE {0} ADD COLUMN {1} INTEGER'.format(
+            TABLE, name))
+    for name in names[4:] + _ic_columns(connection):
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS {0}_{1} ON {0} '
+            '(mod, canon, default_m, ordering, {1})'.format(TABLE, name))
+
+
+def export(path, mods, canon=(True, True, False), default_m=5,
+           every_set=False):
+    """
+    Writes the set-classes of each modulus in mods, for the given canonical
+    operators (T, I, M) and default m in the current ordering (see
+    sator.tables.ordering), to the SQLite database at path. Rows
+    already in the database for the same catalog are replaced. With
+    every_set=True, there is a row for every set in each modulus rather than
+    one for each prime form. Returns the number of rows written.
+    """
+    connection = sqlite3.connect(path)
+    total = 0
+    try:
+        with connection:
+            for mod in mods:
+                total += _export(connection, catalog.get(mod, canon,
+                                                         default_m),
+                                 every_set)
+    finally:
+        connection.close()
+    return total
+
+
+def _export(connection, classes, every_set):
+    """Writes the rows of a catalog. Returns the number of rows written."""
+    mod = classes.mod
+    _create(connection, mod)
+    key = (mod, _canon_letters(classes.canon), classes.default_m,
+           classes.ordering)
+    connection.execute('DELETE FROM {0} WHERE mod = ? AND canon = ? AND '
+                       'default_m = ? AND ordering = ?'.format(TABLE), key)
+    names = [name for name, _ in COLUMNS] + \
+        ['ic{0}'.format(ic) for ic in range(0, mod // 2 + 1)]
+    statement = 'INSERT INTO {0} ({1}) VALUES ({2})'.format(
+        TABLE, ', '.join(names), ', '.join(['?'] * len(names)))
+    rows = {}
+    columns = classes.columns
+    for row, prime in enumerate(classes.primes):
+        icv = columns['icv'][row]
+        rows[prime] = [prime, columns['card'][row], json.dumps(list(icv)),
+                       columns['name'][row], columns['ds'][row],
+                       json.dumps([list(each) for each \
+                                   in columns['invariance_vector'][row]]),
+                       columns['complement'][row], columns['mpartner'][row]] \
+            + list(icv)
+    if every_set:
+        integers = range(0, 2 ** mod)
+    else:
+        integers = classes.primes
+    values = (key + (integer,) + tuple(rows[tables.prime_form(
+        integer, mod, classes.canon, classes.default_m)[0]]) \
+              for integer in integers)
+    connection.executemany(statement, values)
+    return len(integers)
+
+
+def query(path, where='1', params=(), mod=12, canon=(True, True, False),
+          default_m=5):
+    """
+    Returns a list of the integer representations of the prime forms in a
+    database written by export() that match an SQL WHERE clause (with ?
+    placeholders for params), in prime order, for the given modulus,
+    canonical operators (T, I, M) and default m in the current ordering (see
+    sator.tables.ordering).
+    Ex:
+        query('classes.db', 'card = ? AND ds >= 2 AND ic6 = 0', (7,))
+    """
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.execute(
+            'SELECT DISTINCT prime FROM {0} WHERE mod = ? AND canon = ? AND '
+            'default_m = ? AND ordering = ? AND ({1}) ORDER BY '
+            'prime'.format(TABLE, where),
+            (mod, _canon_letters(canon), default_m,
+             tables._cache_key(mod, canon, default_m)[3]) + tuple(params))
+        return [row[0] for row in cursor]
+    finally:
+        connection.close()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+"""
+Immutable, hashable variants of the PCSet, PSet and ToneRow classes.
+
+Frozen objects share the analysis API of their mutable counterparts, but any
+method that would change the object in place raises an ImmutableObject
+exception. Since they can never change, derived values such as prime, icv and
+forte are computed once and cached for the life of the object.
+"""
+
+from sator.setrowbase import SetRowBase, flag, FROZEN
+from sator.setbase import SetBase
+from sator.pcset import PCSet
+from sator.pset import PSet
+from sator.tonerow import ToneRow
+
+
+def cached(prop):
+    """
+    Wrap a property so that its value is computed once per frozen object.
+    Values which are sator objects are frozen before they are cached and lists
+    are copied on the way out so that the cache can not be changed by callers.
+    """
+    name = prop.fget.__name__
+
+    def _(self):
+        if not self._frozen:
+            return prop.fget(self)
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        try:
+            value = cache[name]
+        except KeyError:
+            value = prop.fget(self)
+            if isinstance(value, SetRowBase):
+                value = freeze(value)
+            cache[name] = value
+        if isinstance(value, (list, set, dict)):
+            return type(value)(value)
+        return value
+    _.__name__ = name
+    _.__doc__ = prop.__doc__
+    return property(_)
+
+
+def immutable(name):
+    """Returns a method that raises ImmutableObject in place of a mutator"""
+    def _(self, *args, **kwargs):
+        msg = '{0} objects can not be changed in place with {1}()'.format(
+            self.__class__.__name__, name)
+        raise self.ImmutableObject(msg)
+    _.__name__ = name
+    return _
+
+
+class FrozenBase(object):
+    """Base class for frozen PC/pitch sets and tone rows"""
+
+    __slots__ = ()
+
+    _frozen = flag(FROZEN)
+    _mutable_class = None
+
+    class ImmutableObject(Exception):
+        pass
+
+    def __init__(self, *args, **kwargs):
+        canon = kwargs.pop('canon', None)
+        default_m = kwargs.pop('default_m', None)
+        super(FrozenBase, self).__init__(*args, **kwargs)
+        if canon is not None and hasattr(self, '_canon_t'):
+            self._canon_t, self._canon_i, self._canon_m = \
+                [True if value else False for value in canon]
+        if default_m:
+            self._default_m = default_m
+        self._frozen = True
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __setitem__(self, key, value):
+        if self._frozen:
+            immutable('__setitem__')(self)
+        super(FrozenBase, self).__setitem__(key, value)
+
+    def _check_setting(self, name, value):
+        """Raise if a setting is changed after the object is constructed"""
+        if value is not None and self._frozen:
+            immutable(name)(self)
+
+    def mod(self, new_mod=None):
+        self._check_setting('mod', new_mod)
+        return super(FrozenBase, self).mod(new_mod)
+    mod.__doc__ = SetRowBase.mod.__doc__
+
+    def default_m(self, new_m=None):
+        self._check_setting('default_m', new_m)
+        return super(FrozenBase, self).default_m(new_m)
+    default_m.__doc__ = SetRowBase.default_m.__doc__
+
+    def multiset(self, value=None):
+        self._check_setting('multiset', value)
+        return super(FrozenBase, self).multiset(value)
+    multiset.__doc__ = SetRowBase.multiset.__doc__
+
+    def ordered(self, value=None):
+        self._check_setting('ordered', value)
+        return super(FrozenBase, self).ordered(value)
+    ordered.__doc__ = SetRowBase.ordered.__doc__
+
+    def storage(self, value=None):
+        self._check_setting('storage', value)
+        return super(FrozenBase, self).storage(value)
+    storage.__doc__ = SetRowBase.storage.__doc__
+
+    def _set_pitches(self, value):
+        if self._frozen:
+            immutable('pitches')(self)
+        SetRowBase.pitches.fset(self, value)
+
+    pitches = property(SetRowBase.pitches.fget, _set_pitches,
+                       doc=SetRowBase.pitches.__doc__)
+
+    def copy(self, pitches=None, **kwargs):
+        if self._storage == 'view':
+            # Copies of views are independent, so they are mutable
+            new = self.thaw()
+            if pitches is None and not kwargs:
+                return new
+            return new.copy(pitches, **kwargs)
+        return super(FrozenBase, self).copy(pitches, **kwargs)
+    copy.__doc__ = SetRowBase.copy.__doc__
+
+    def _blank(self, cls=None):
+        if cls is None and self._storage == 'view':
+            # Results derived from a view, such as those of operations and
+            # arithmetic, are mutable objects with list storage
+            new = super(FrozenBase, self)._blank(self._mutable_class)
+            new._flags &= ~FROZEN
+            new._storage = 'list'
+            return new
+        return super(FrozenBase, self)._blank(cls)
+    _blank.__doc__ = SetRowBase._blank.__doc__
+
+    t = immutable('t')
+    i = immutable('i')
+
+    def freeze(self):
+        """Returns the given object, which is already frozen."""
+        return self
+
+    def thaw(self):
+        """
+        Returns a mutable copy of the given object with the same pitches and
+        settings.
+        """
+        return convert(self, self._mutable_class)
+
+
+class FrozenSetBase(FrozenBase):
+    """Base class for FrozenPCSet and FrozenPSet"""
+
+    __slots__ = ()
+
+    insert = immutable('insert')
+    clear = immutable('clear')
+    canon = immutable('canon')
+
+    def canon_group(self, multipliers=None, transpose=True):
+        self._check_setting('canon_group', multipliers)
+        return super(FrozenSetBase, self).canon_group(multipliers, transpose)
+    canon_group.__doc__ = SetBase.canon_group.__doc__
+
+    setint = cached(SetBase.setint)
+    pcint = cached(SetBase.pcint)
+    cardinality = cached(SetBase.cardinality)
+    prime_operation = cached(SetBase.prime_operation)
+    prime = cached(SetBase.prime)
+    mpartner = cached(SetBase.mpartner)
+    forte = cached(SetBase.forte)
+    literal_compliment = cached(SetBase.literal_compliment)
+    abstract_compliment = cached(SetBase.abstract_compliment)
+    icv = cached(SetBase.icv)
+    zpartner = cached(SetBase.zpartner)
+    invariance_vector = cached(SetBase.invariance_vector)
+    ds = cached(SetBase.ds)
+    orbit_size = cached(SetBase.orbit_size)
+
+
+class FrozenPCSet(FrozenSetBase, PCSet):
+    """An immutable, hashable PCSet"""
+
+    __slots__ = ()
+
+    _mutable_class = PCSet
+
+    m = immutable('m')
+    mi = immutable('mi')
+    t_m = immutable('t_m')
+    c = immutable('c')
+    z = immutable('z')
+
+
+class FrozenPSet(FrozenSetBase, PSet):
+    """An immutable, hashable PSet"""
+
+    __slots__ = ()
+
+    _mutable_class = PSet
+
+    root = cached(PSet.root)
+
+
+class FrozenToneRow(FrozenBase, ToneRow):
+    """An immutable, hashable ToneRow"""
+
+    __slots__ = ()
+
+    _mutable_class = ToneRow
+
+    m = immutable('m')
+    mi = immutable('mi')
+    t_m = immutable('t_m')
+    swap = immutable('swap')
+
+    P = cached(ToneRow.P)
+    R = cached(ToneRow.R)
+    I = cached(ToneRow.I)
+    RI = cached(ToneRow.RI)
+    M = cached(ToneRow.M)
+    MI = cached(ToneRow.MI)
+    RM = cached(ToneRow.RM)
+    RMI = cached(ToneRow.RMI)
+
+
+FROZEN_TYPES = {
+    PCSet: FrozenPCSet,
+    PSet: FrozenPSet,
+    ToneRow: FrozenToneRow,
+}
+
+
+def convert(obj, cls):
+    """
+    Returns a new instance of cls with the pitches and settings of a given
+    ToneRow, PSet or PCSet.
+    """
+    kwargs = {
+        'mod': obj._mod,
+        'ordered': obj._ordered,
+        'multiset': obj._multiset,
+        'storage': obj._storage if obj._storage != 'view' else 'list',
+    }
+    if issubclass(cls, FrozenBase):
+        kwargs['default_m'] = obj._default_m
+        if hasattr(obj, 'get_canon'):
+            kwargs['canon'] = obj.get_canon
+        new = cls(obj.pitches, **kwargs)
+    else:
+        new = cls(obj.pitches, **kwargs)
+        new._default_m = obj._default_m
+        if hasattr(new, 'canon'):
+            new.canon(*obj.get_canon)
+    if hasattr(new, '_group') and hasattr(obj, '_group'):
+        new._group = obj._group
+    return new
+
+
+def view(obj, key):
+    """
+    Returns a frozen object with the settings of a given ToneRow, PSet or
+    PCSet that reads the pitches or pcs at an index or slice of its ppc.
+    The view keeps a reference to the ppc list of the object, which is
+    replaced rather than changed when the object changes, so the view is
+    never affected by later changes to the object.
+    """
+    ppc = obj._ppc
+    if not isinstance(key, slice):
+        # Raise IndexError now rather than when the view is read
+        ppc[key]
+    if isinstance(obj, FrozenBase):
+        cls = obj.__class__
+    else:
+        cls = frozen_class(obj.__class__)
+    if cls is None:
+        # No frozen counterpart, so fall back to a copy
+        pitches = ppc[key] if isinstance(key, slice) else [ppc[key]]
+        return obj._new(pitches)
+    new = obj._blank(cls)
+    new._frozen = True
+    new._storage = 'view'
+    new._pitches = (ppc, key)
+    return new
+
+
+def frozen_class(cls):
+    """
+    Returns the frozen class for a mutable ToneRow, PSet or PCSet class, or
+    None if there is not one.
+    """
+    for each in cls.__mro__:
+        if each in FROZEN_TYPES:
+            return FROZEN_TYPES[each]
+
+
+def freeze(obj):
+    """
+    Returns a frozen copy of a ToneRow, PSet or PCSet. Frozen objects are
+    returned as is.
+    """
+    if isinstance(obj, FrozenBase):
+        return obj
+    cls = frozen_class(obj.__class__)
+    if cls is not None:
+        return convert(obj, cls)
+    raise TypeError('{0} objects can not be frozen'.format(
+        obj.__class__.__name__))
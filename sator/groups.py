@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+"""
+Groups of TnMm operations used as canonical equivalence for set-classes.
+
+An AffineGroup is a subgroup of the affine group of a modulus, given by a set
+of multipliers (units of the modulus) and whether Tn is included. The
+canon(T, I, M) settings of a set cover the groups generated by 1, mod - 1 and
+the default m. Use SetBase.canon_group() to use any other group, such as the
+full unit group of a modulus:
+
+    a = PCSet(0, 1, 3, mod=7)
+    a.canon_group(groups.units(7))
+    a.prime
+"""
+
+from bisect import bisect_left
+
+import sator.utils as utils
+import sator.tables as tables
+
+# Force Python 2.X to use xrange
+try:
+    range = xrange
+except:
+    pass
+
+_groups = {}
+
+
+def units(mod=12):
+    """Returns the units of a modulus, which are the possible multipliers."""
+    return [m for m in range(1, mod + 1) if utils.gcd(m % mod, mod) == 1]
+
+
+def prime_counts(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns a list of the number of set-classes of each cardinality (the
+    index of the list) in a modulus, for the given canonical operators
+    (T, I, M) and default m. When the operators form a group, as T, T/I and
+    T/I/M do in mod 12, these are counted by AffineGroup.counts() without
+    enumerating any prime forms. Otherwise (such as T/I/M in mod 7, or a
+    default m which is not a unit) prime forms are not the orbits of a
+    group, so each one is enumerated and counted (see count_primes()).
+    """
+    operations = utils.canonical_operations(mod, canon, default_m)
+    if utils.is_group(mod, operations):
+        return get(mod, operations, canon[0]).counts()
+    return [count_primes(mod, canon, default_m, card) \
+            for card in range(0, mod + 1)]
+
+
+def count_primes(mod=12, canon=(True, True, False), default_m=5, card=None):
+    """
+    Returns the number of prime forms in a modulus for the given canonical
+    operators (T, I, M) and default m, optionally only those with a given
+    cardinality. Unless the operators form a group, this enumerates the
+    prime forms with utils.primes(), which takes time in proportion to the
+    number of Tn-types (about 2 ** mod / mod), so it is only practical for
+    moduli up to about 24.
+    """
+    operations = utils.canonical_operations(mod, canon, default_m)
+    if utils.is_group(mod, operations):
+        counts = get(mod, operations, canon[0]).counts()
+        if card is None:
+            return sum(counts)
+        return counts[card] if 0 <= card <= mod else 0
+    return sum(1 for _ in utils.primes(mod, card, canon, default_m))
+
+
+def get(mod=12, multipliers=(1,), transpose=True):
+    """
+    Returns the shared AffineGroup for a modulus, generated by the given
+    multipliers, with or without Tn.
+    """
+    key = (mod, tuple(sorted(set([m % mod for m in multipliers]))),
+           True if transpose else False)
+    group = _groups.get(key)
+    if group is None:
+        group = AffineGroup(*key)
+        # Share one group between the multipliers that generate it
+        group = _groups.setdefault(group.key, group)
+        _groups[key] = group
+    return group
+
+
+class AffineGroup(object):
+    """
+    A group of TnMm operations in a modulus. The given multipliers are
+    closed under multiplication, so the group holds every product of them.
+    """
+
+    class InvalidGroup(Exception):
+        pass
+
+    def __init__(self, mod=12, multipliers=(1,), transpose=True):
+        self.mod = mod
+        self.transpose = True if transpose else False
+        closed = set([1 % mod])
+        for m in multipliers:
+            if utils.gcd(m % mod, mod) != 1:
+                msg = '{0} is not a unit of mod {1}'.format(m, mod)
+                raise self.InvalidGroup(msg)
+            closed.add(m % mod)
+        new = closed
+        while new:
+            products = set([a * b % mod for a in closed for b in new])
+            new = products - closed
+            closed |= new
+        self.multipliers = tuple(sorted(closed))
+        self._table = None
+        self._counts = None
+        self._primes = {}
+        self._icvs = {}
+
+    def __len__(self):
+        return len(self.multipliers) * (self.mod if self.transpose else 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, AffineGroup):
+            return NotImplemented
+        return self.key == other.key
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return 'AffineGroup(mod={0}, multipliers={1}, transpose={2})'.format(
+            self.mod, list(self.multipliers), self.transpose)
+
+    @property
+    def key(self):
+        """Returns (mod, multipliers, transpose) for the group"""
+        return (self.mod, self.multipliers, self.transpose)
+
+    def each_n(self):
+        """Yields each n of the group's operations"""
+        return range(0, self.mod) if self.transpose else (0,)
+
+    def operations(self):
+        """Yields an (n, m) pair for each operation in the group"""
+        for m in self.multipliers:
+            for n in self.each_n():
+                yield (n, m)
+
+    def act(self, integer, n, m):
+        """
+        Returns the integer representation of a PC set after TnMm, given its
+        integer representation.
+        """
+        return utils.rotate(utils.multiply_int(integer, m, self.mod), n,
+                            self.mod)
+
+    @property
+    def table(self):
+        """
+        Returns a table (primes, ns, ms) indexed by integer representation as
+        given by tables.orbit_table. The table is built on first use, and only
+        for moduli no greater than tables.MAX_MOD. Returns None otherwise.
+        """
+        if self._table is None and self.mod <= tables.MAX_MOD:
+            self._table = tables.orbit_table(self.mod, self.multipliers,
+                                             self.transpose)
+        return self._table
+
+    def orbit(self, integer):
+        """
+        Returns the set of integer representations of the sets in the orbit
+        of an integer representation, i.e. its set-class.
+        """
+        orbit = set()
+        for m in self.multipliers:
+            multiplied = utils.multiply_int(integer, m, self.mod)
+            for n in self.each_n():
+                orbit.add(utils.rotate(multiplied, n, self.mod))
+        return orbit
+
+    def orbit_size(self, integer):
+        """Returns the number of sets in the set-class of a set"""
+        return len(self) // len(self.stabilizer(integer))
+
+    def stabilizer(self, integer):
+        """
+        Returns the list of (n, m) pairs of the operations that map a set to
+        itself, given its integer representation.
+        """
+        return [(n, m) for n, m in self.operations() \
+                if self.act(integer, n, m) == integer]
+
+    def prime_form(self, integer):
+        """
+        Returns (prime, (n, m)) for an integer representation as
+        utils.prime_form does, with the group as its canonical operations.
+        """
+        table = self.table
+        if table is not None:
+            primes, ns, ms = table
+            return primes[integer], (ns[integer], ms[integer])
+        best = None
+        for m in self.multipliers:
+            multiplied = utils.multiply_int(integer, m, self.mod)
+            for n in self.each_n():
+                value = utils.rotate(multiplied, n, self.mod)
+                if best is None or (value, n) < best[:2]:
+                    best = (value, n, m)
+        return best[0], (best[1], best[2])
+
+    def primes(self, card=None):
+        """
+        Yields the integer representation of each prime form of the group in
+        ascending order, optionally only those with a given cardinality.
+        """
+        if not self.transpose:
+            for integer in range(0, 2 ** self.mod):
+                if (card is None or utils.popcount(integer) == card) and \
+                        self.prime_form(integer)[0] == integer:
+                    yield integer
+            return
+        for integer in utils.necklaces(self.mod, card):
+            for m in self.multipliers[1:]:
+                multiplied = utils.multiply_int(integer, m, self.mod)
+                if utils.lowest_rotation(multiplied, self.mod) < integer:
+                    break
+            else:
+                yield integer
+
+    def ordinal(self, integer):
+        """
+        Returns the position (from 1) of the set-class of an integer
+        representation among the prime forms of the group with the same
+        cardinality, in prime order, as tables.ordinal() does.
+        """
+        prime = self.prime_form(integer)[0]
+        card = utils.popcount(prime)
+        each_prime = self._primes.get(card)
+        if each_prime is None:
+            each_prime = self._primes[card] = tuple(self.primes(card))
+        return bisect_left(each_prime, prime) + 1
+
+    def icv_index(self, card):
+        """
+        Returns a dict mapping each interval class vector (as a tuple) of the
+        prime forms of the group with a given cardinality to a tuple of those
+        prime forms, as tables.icv_index() does.
+        """
+        index = self._icvs.get(card)
+        if index is None:
+            index = self._icvs[card] = tables.index_icvs(self.primes(card),
+                                                         self.mod)
+        return index
+
+    def counts(self):
+        """
+        Returns a list of the number of set-classes (orbits) of each
+        cardinality (the index of the list) in the modulus of the group.
+        These are counted with Burnside's lemma rather than enumerated: each
+        operation fixes the sets that are unions of its cycles, which are
+        counted by the coefficients of the product of (1 + x^len) over its
+        cycles.
+        """
+        if self._counts is None:
+            mod = self.mod
+            totals = [0] * (mod + 1)
+            for n, m in self.operations():
+                fixed = [1] + [0] * mod
+                seen = [False] * mod
+                for start in range(0, mod):
+                    length = 0
+                    pc = start
+                    while not seen[pc]:
+                        seen[pc] = True
+                        pc = (pc * m + n) % mod
+                        length += 1
+                    if length:
+                        for card in range(mod, length - 1, -1):
+                            fixed[card] += fixed[card - length]
+                totals = [total + each for total, each in zip(totals, fixed)]
+            self._counts = [total // len(self) for total in totals]
+        return self._counts[:]
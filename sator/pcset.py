@@ -8,7 +8,10 @@ class PCSet(SetBase, PCBase):
     A Class for pitch class sets which adds pitch class only methods
     """
 
+    __slots__ = ()
+
     pitchset = False
+    _storage_types = ('list', 'bitmask')
 
     def c(self):
         """Change the given object in place to its literal compliment."""
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+An opt-in flyweight pool of shared, immutable PCSets.
+
+When the pool is enabled, fromint(), each_set_in_mod(), each_card_in_mod(),
+subprimes(), superprimes() and m_vector() return one shared FrozenPCSet per
+(modulus, setint, canonical operators, default m) rather than building a new
+PCSet each time. Since FrozenPCSets cache their derived values, repeated walks
+over a catalog only compute prime forms, icvs and so on once per set. The pool
+only holds weak references, so sets that are no longer used elsewhere are
+evicted.
+
+    from sator import pool
+    pool.enable()
+"""
+
+from weakref import WeakValueDictionary
+
+import sator.utils as utils
+from sator.frozen import FrozenPCSet
+
+_pool = WeakValueDictionary()
+_enabled = False
+
+
+def enable():
+    """Make the set generators and fromint() return pooled FrozenPCSets."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop using the pool and drop the sets it holds."""
+    global _enabled
+    _enabled = False
+    _pool.clear()
+
+
+def enabled():
+    """Returns True if the pool is enabled."""
+    return _enabled
+
+
+def clear():
+    """Drop every set held by the pool."""
+    _pool.clear()
+
+
+def size():
+    """Returns the number of sets currently held by the pool."""
+    return len(_pool)
+
+
+def get(integer, mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns the shared FrozenPCSet with the pc's of an integer representation
+    in the given modulus, canonical operators (T, I, M) and default m. The set
+    is created if it is not already held by the pool.
+    """
+    canon = tuple([True if value else False for value in canon])
+    key = (mod, integer, canon, default_m)
+    new = _pool.get(key)
+    if new is None:
+        new = FrozenPCSet(utils.fromint(integer), mod=mod, canon=canon,
+                          default_m=default_m)
+        _pool[key] = new
+    return new
+
+
+def provides(cls):
+    """
+    Returns True if the pool is enabled and its sets can stand in for
+    instances of cls.
+    """
+    return _enabled and issubclass(FrozenPCSet, cls)
@@ -8,7 +8,10 @@ from sator.setbase import SetBase
 class PSet(SetBase):
     """A class for pitch sets, which adds pitch set only methods."""
 
+    __slots__ = ()
+
     pitchset = True
+    _storage_types = ('list', 'array')
 
     class Mod12Only(Exception):
         pass
@@ -43,7 +46,7 @@ class PSet(SetBase):
                 fifths = self._fifths(roots[0])
             except self.NotNeoR:
                 return f(self)
-            root_indexes = [index for index, p in enumerate(self[:]) if p in roots]
+            root_indexes = [index for index, p in enumerate(self._ppc) if p in roots]
             return f(self, major, root_indexes, thirds, fifths, *args[1:], **kwargs)
         _.__name__ = f.__name__
         _.__module__ = f.__module__
@@ -56,12 +59,13 @@ class PSet(SetBase):
         """
         Find the root(s) of an ordered pitch set, using Paul Hindemith's method
         """
-        if not self[:]:
+        ppc = self._ppc
+        if not ppc:
             return []
         totals = {}
-        for p in self[:]:
+        for p in ppc:
             totals[p] = 0
-        for each in combinations(self[:], 2):
+        for each in combinations(ppc, 2):
             diff = abs(each[1] - each[0]) % self._mod
             # Ignore tritones.
             if diff == 6:
@@ -86,7 +90,7 @@ class PSet(SetBase):
         root_pc = root % self._mod
         thirds = []
         major = None
-        for index, pc in enumerate(self.pcs):
+        for index, pc in enumerate(self._pcs):
             if pc == root_pc + 3 or pc == root_pc - 9:
                 major = False
                 thirds.append((index, major))
@@ -103,7 +107,7 @@ class PSet(SetBase):
     def _fifths(self, root):
         root_pc = root % self._mod
         fifths = []
-        for index, pc in enumerate(self.pcs):
+        for index, pc in enumerate(self._pcs):
             if pc == root_pc + 7 or pc == root_pc - 5:
                 fifths.append(index)
         if len(fifths) < 1:
@@ -116,11 +120,11 @@ class PSet(SetBase):
         if not args:
             return self.copy()
         major, roots, thirds, fifths = args[:4]
-        new = self.copy()
+        pitches = self.pitches[:]
         for third in thirds:
-            new[third] = new.pitches[third] - 1 \
-                if major else new.pitches[third] + 1
-        return new
+            pitches[third] = pitches[third] - 1 \
+                if major else pitches[third] + 1
+        return self._new(self._normalize(pitches))
 
     @checkMod12
     @neo_oper
@@ -128,14 +132,14 @@ class PSet(SetBase):
         if not args:
             return self.copy()
         major, roots, thirds, fifths = args[:4]
-        new = self.copy()
+        pitches = self.pitches[:]
         if major:
             for root in roots:
-                new[root] = new.pitches[root] - 1
+                pitches[root] = pitches[root] - 1
         else:
             for fifth in fifths:
-                new[fifth] = new.pitches[fifth] + 1
-        return new
+                pitches[fifth] = pitches[fifth] + 1
+        return self._new(self._normalize(pitches))
 
     @checkMod12
     @neo_oper
@@ -143,14 +147,14 @@ class PSet(SetBase):
         if not args:
             return self.copy()
         major, roots, thirds, fifths = args[:4]
-        new = self.copy()
+        pitches = self.pitches[:]
         if major:
             for fifth in fifths:
-                new[fifth] = new.pitches[fifth] + 2
+                pitches[fifth] = pitches[fifth] + 2
         else:
             for root in roots:
-                new[root] = new.pitches[root] - 2
-        return new
+                pitches[root] = pitches[root] - 2
+        return self._new(self._normalize(pitches))
 
     def H(self):
         """Hexatonic Pole (Cohn)"""
@@ -210,7 +214,7 @@ class PSet(SetBase):
                 if each._unique_pcs == current._unique_pcs:
                     self[:] = current
                     break
-            if self[:] == current:
+            if self == current:
                 break
 
     def paths(self, other):
@@ -221,7 +225,9 @@ class PSet(SetBase):
         given set and the goal set.
         """
         # Verify that other is a transformation of self
-        current = other.copy()
+        # Frozen goals are thawed so that their canon can be set
+        thaw = getattr(other, 'thaw', None)
+        current = thaw() if thaw is not None else other.copy()
         current.canon(True, True, False)
         if self.prime != current.prime:
             raise self.NotNeoR('Neo Riemannian operations will never transform this set into the goal set.')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Benchmarks for sator's internal construction paths.
+
+Compares the trusted constructor used by copy() and the TTO helpers against
+building the same objects through the public constructor, which normalizes
+its arguments again. Reports the time per call and, where tracemalloc is
+available, the peak memory allocated per call.
+"""
+
+import sys
+from timeit import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from sator.core import PCSet, PSet, ToneRow
+
+
+def full_copy(obj, pitches=None):
+    """Copy an object by re-running __init__, as copy() used to."""
+    if pitches is None:
+        pitches = obj.pitches
+    new = obj.__class__(pitches, mod=obj._mod, ordered=obj._ordered,
+                        multiset=obj._multiset, storage=obj._storage)
+    new._default_m = obj._default_m
+    return new
+
+
+def allocated(f, number):
+    """
+    Returns the peak bytes allocated during one call of f, averaged over
+    number calls, or None if tracemalloc can not measure it.
+    """
+    if tracemalloc is None or not hasattr(tracemalloc, 'reset_peak'):
+        return None
+    total = 0
+    tracemalloc.start()
+    for each in range(0, number):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        f()
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return total / float(number)
+
+
+def cases():
+    pcset = PCSet(0, 1, 4, 6, 9)
+    pset = PSet(0, 16, 7, 35, -2, 11)
+    row = ToneRow(0, 4, 5, 8, 9, 1, 10, 3, 6, 2, 7, 11)
+    for name, obj in (('PCSet', pcset), ('PSet', pset), ('ToneRow', row)):
+        yield (name + ' copy', obj.copy, lambda obj=obj: full_copy(obj))
+        yield (name + ' T3', lambda obj=obj: obj._transpose(3),
+               lambda obj=obj: full_copy(obj, [p + 3 for p in obj.pitches]))
+    yield ('PCSet prime', lambda: pcset.prime, None)
+
+
+def run(number=10000):
+    row = '{0:<16}{1:>14}{2:>14}{3:>14}{4:>14}'
+    print(row.format('case', 'trusted us', 'full us', 'trusted B', 'full B'))
+    for name, trusted, full in cases():
+        times = [timeit(f, number=number) * 1e6 / number if f else None \
+                 for f in (trusted, full)]
+        sizes = [allocated(f, number) if f else None for f in (trusted, full)]
+        print(row.format(name, *['-' if value is None else '{0:.1f}'.format(value) \
+                                 for value in times + sizes]))
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 10000)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Random samples of set-classes and sets, as arrays of integer
+representations.
+
+Set-classes are drawn either uniformly, so that each set-class of a modulus
+(or of one cardinality) is equally likely, or weighted by orbit size, which
+is the set-class of a uniformly drawn set. Both draw from the prime forms
+of sator.tables, so no prime form is found more than once:
+
+    from sator import sample
+    sample.primes(1000, 12, card=6, seed=1)
+    sample.primes(1000, 12, weighted=True)
+
+Each function takes a seed, which is an int, None (for a fresh seed) or a
+random.Random to continue drawing from. SetBase.sample_primes_in_mod() and
+SetBase.sample_sets_in_mod() give the samples as objects.
+"""
+
+import random
+from array import array
+
+import sator.tables as tables
+
+# Force Python 2.X to use xrange
+try:
+    range = xrange
+except:
+    pass
+
+
+def _random(seed):
+    """Returns a random.Random for a seed, or the seed if it is one."""
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def _array(integers, mod):
+    """
+    Returns an array of integer representations in a modulus, with the
+    smallest typecode which holds them, or a list if none does.
+    """
+    for typecode in ('H', 'I', 'L', 'Q'):
+        try:
+            if array(typecode).itemsize * 8 >= mod:
+                return array(typecode, integers)
+        except ValueError:
+            # Python 2 does not have the Q typecode
+            pass
+    return list(integers)
+
+
+def _set_ints(count, mod, card, rng):
+    """Yields the integer representations of count uniformly drawn sets."""
+    pcs = list(range(0, mod))
+    for _ in range(0, count):
+        if card is None:
+            yield rng.getrandbits(mod) if mod else 0
+        else:
+            yield sum([1 << pc for pc in rng.sample(pcs, card)])
+
+
+def sets(count, mod=12, card=None, seed=None):
+    """
+    Returns an array of the integer representations of count sets drawn
+    uniformly from a modulus, optionally only those of a given cardinality.
+    """
+    return _array(_set_ints(count, mod, card, _random(seed)), mod)
+
+
+def primes(count, mod=12, canon=(True, True, False), default_m=5, card=None,
+           weighted=False, seed=None):
+    """
+    Returns an array of the integer representations of the prime forms of
+    count set-classes drawn from a modulus, for the given canonical operators
+    (T, I, M) and default m, optionally only those of a given cardinality.
+    Each set-class is equally likely, or with weighted=True, as likely as the
+    number of sets in it (its orbit size).
+    """
+    rng = _random(seed)
+    if weighted:
+        integers = [tables.prime_form(integer, mod, canon, default_m)[0] \
+                    for integer in _set_ints(count, mod, card, rng)]
+    else:
+        each_prime = tables.prime_ints(mod, canon, default_m, card)
+        integers = [rng.choice(each_prime) for _ in range(0, count)]
+    return _array(integers, mod)
+
+
+def group_primes(count, group, card=None, weighted=False, seed=None):
+    """
+    Same as primes(), but for the set-classes of an AffineGroup (see
+    sator.groups).
+    """
+    rng = _random(seed)
+    if weighted:
+        integers = [group.prime_form(integer)[0] \
+                    for integer in _set_ints(count, group.mod, card, rng)]
+    else:
+        each_prime = tuple(group.primes(card))
+        integers = [rng.choice(each_prime) for _ in range(0, count)]
+    return _array(integers, group.mod)
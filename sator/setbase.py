@@ -1,5 +1,5 @@
 #!/usr/bin/env python
-from itertools import count, combinations
+from itertools import combinations
 
 # Force Python 2.X to use izip and xrange
 try:
@@ -11,17 +11,42 @@ else:
     range = xrange
 
 import sator.utils as utils
+import sator.tables as tables
+import sator.groups as groups
 from sator.const import Z_PARTNERS
 
-from sator.setrowbase import SetRowBase, PCBase
+from sator.setrowbase import SetRowBase, PCBase, flag, CANON_T, CANON_I, \
+    CANON_M
 
 
 class SetBase(SetRowBase):
     """Base class for PCSet and PSet"""
 
-    _canon_t = True
-    _canon_i = True
-    _canon_m = False
+    # _group is None, or (multipliers, transpose) as given to canon_group()
+    __slots__ = ('_group',)
+
+    _default_flags = CANON_T | CANON_I
+
+    _canon_t = flag(CANON_T)
+    _canon_i = flag(CANON_I)
+    _canon_m = flag(CANON_M)
+
+    def __init__(self, *args, **kwargs):
+        self._group = None
+        super(SetBase, self).__init__(*args, **kwargs)
+
+    def __getstate__(self):
+        return super(SetBase, self).__getstate__() + (self._group,)
+
+    def __setstate__(self, state):
+        super(SetBase, self).__setstate__(state[:-1])
+        self._group = state[-1]
+
+    def _blank(self, cls=None):
+        new = super(SetBase, self)._blank(cls)
+        new._group = self._group
+        return new
+    _blank.__doc__ = SetRowBase._blank.__doc__
 
     def __sub__(self, other):
         """Remove all instances of a given pc from a pcset"""
@@ -30,11 +55,9 @@ class SetBase(SetRowBase):
             rm_pcs = [other]
         if isinstance(other, set):
             rm_pcs = [int(num) for num in other]
-        results = self.pitches[:]
-        for pc in rm_pcs:
-            while pc in results:
-                results.remove(pc)
-        return self.copy(results)
+        rm_pcs = set(rm_pcs)
+        return self._new([pitch for pitch in self.pitches \
+                          if pitch not in rm_pcs])
 
     def insert(self, place, pitch):
         """
@@ -49,7 +72,7 @@ class SetBase(SetRowBase):
             pitches.extend(self.pitches[place:])
             self[:] = pitches
         except IndexError:
-            self[:].append(pitch)
+            self.pitches = self.pitches + [pitch]
 
     def clear(self):
         """Remove all pitches/pitch classes from the object."""
@@ -67,10 +90,31 @@ class SetBase(SetRowBase):
 
             a.prime would now give the Tn-type, and ignore inversion as an
             operation for determining set-class membership.
+        Replaces any group given to canon_group().
         """
         self._canon_t = True if t else False
         self._canon_i = True if i else False
         self._canon_m = True if m else False
+        self._group = None
+
+    def canon_group(self, multipliers=None, transpose=True):
+        """
+        Takes a list of multipliers and a boolean for whether Tn is canonical.
+        Set-classes are then the orbits of the group of TnMm operations that
+        these generate (see sator.groups) in place of the canon() settings.
+        The multipliers must be units of the modulus, otherwise an
+        AffineGroup.InvalidGroup exception is raised.
+        Ex:
+            a.canon_group([1, 2, 4], False)
+        Without arguments, returns the current AffineGroup, or None if the
+        canon() settings are used.
+        """
+        if multipliers is None:
+            if self._group is None:
+                return None
+            return groups.get(self._mod, *self._group)
+        groups.get(self._mod, multipliers, transpose)
+        self._group = (tuple(multipliers), True if transpose else False)
 
     @property
     def get_canon(self):
@@ -89,18 +133,47 @@ class SetBase(SetRowBase):
             Ex:
                 0 = [], 1 = [0], 2 = [1], 3 = [0, 1], 4 = [2], 5 = [0, 2]
                 PCSet.fromint(5) returns PCSet([0, 2])
+        When the pool is enabled (see sator.pool), the PCSet is a shared
+        FrozenPCSet.
         """
+        from sator import pool
+        if pool.enabled():
+            return pool.get(integer, modulus)
         from sator.pcset import PCSet
         new_set = PCSet(mod=modulus)
         new_set.pitches = utils.fromint(integer)
         return new_set
 
+    def _copy_bits(self, integer):
+        """
+        Returns a copy of the given object holding the pc's of an integer
+        representation. Bitmask objects keep the integer as is.
+        """
+        if self._storage == 'bitmask':
+            new = self._blank()
+            new._pitches = integer & (2 ** self._mod - 1)
+            return new
+        return self.copy(utils.fromint(integer))
+
+    def _bits_of(self, other):
+        """
+        Returns the integer representation of the pc's of another set-like
+        object, taking into account the modulus of the given object.
+        """
+        if getattr(other, '_storage', None) == 'bitmask':
+            return other._pitches
+        if isinstance(other, int):
+            other = [other]
+        return utils.setint(set([int(pc) % self._mod for pc in other]))
+
     @property
     def setint(self):
         """
         Returns the integer representation for the unique PC's in a given
         object
         """
+        if self._storage == 'bitmask':
+            return self._pitches
         return utils.setint(self._unique_pcs)
 
     @property
@@ -108,7 +181,7 @@ class SetBase(SetRowBase):
         """
         Returns the integer representation of a given object in prime form.
         """
-        return utils.setint(self.prime)
+        return self._prime_form[0]
 
     def each_set(self):
         """
@@ -118,9 +191,24 @@ class SetBase(SetRowBase):
 
     def each_prime(self):
         """
-        Yields each unique set-class in the modulus of the given object.
+        Yields each unique set-class in the modulus of the given object, as
+        given by its canonical operators, in prime order.
         """
-        return self.each_prime_in_mod(self._mod)
+        if self._group is None:
+            return self.each_prime_in_mod(self._mod, self.get_canon,
+                                          self._default_m)
+        return self._each_in_group(self.canon_group().primes())
+
+    def _each_in_group(self, integers):
+        """
+        Yields an object of the given object's class, modulus and canonical
+        group for each integer representation.
+        """
+        for integer in integers:
+            new = self.__class__(utils.fromint(integer), mod=self._mod)
+            new._default_m = self._default_m
+            new._group = self._group
+            yield new
 
     def each_card(self):
         """
@@ -131,109 +219,214 @@ class SetBase(SetRowBase):
 
     @classmethod
     def each_set_in_mod(cls, mod):
+        """
+        Same as the instance method but takes one positional arg as the
+        modulus. Yields shared FrozenPCSets when the pool is enabled.
+        """
+        from sator import pool
+        if pool.provides(cls):
+            return (pool.get(integer, mod) for integer in range(0, 2 ** mod))
         return(cls(utils.fromint(integer), mod=mod) for integer in range(0, 2 ** mod))
 
     @classmethod
-    def each_prime_in_mod(cls, mod):
-        return(each for each in cls.each_set_in_mod(mod) if each.prime == each)
+    def each_prime_in_mod(cls, mod, canon=(True, True, False), default_m=5):
+        """
+        Same as the instance method but takes one positional arg as the
+        modulus, and optionally the canonical operators (T, I, M) and default
+        m. Yields shared FrozenPCSets when the pool is enabled.
+        """
+        return cls._each_int_in_mod(
+            tables.prime_ints(mod, canon, default_m), mod, canon, default_m)
+
+    @classmethod
+    def _each_int_in_mod(cls, integers, mod, canon=(True, True, False),
+                         default_m=5):
+        """
+        Yields an object for each integer representation with the given
+        modulus, canonical operators and default m. Yields shared
+        FrozenPCSets when the pool is enabled.
+        """
+        from sator import pool
+        if pool.provides(cls):
+            for integer in integers:
+                yield pool.get(integer, mod, canon, default_m)
+            return
+        for integer in integers:
+            new = cls(utils.fromint(integer), mod=mod)
+            new.canon(*canon)
+            new._default_m = default_m
+            yield new
 
     @classmethod
     def each_card_in_mod(cls, card, mod):
         """
         Same as the instance method but takes two args for cardinality and
-        modulus respectively
+        modulus respectively. Yields shared FrozenPCSets when the pool is
+        enabled.
         """
+        from sator import pool
+        if pool.provides(cls):
+            return (pool.get(utils.setint(each), mod) \
+                    for each in combinations(cls.each_n_in_mod(mod), card))
         return (cls(each, mod=mod) for each in combinations(cls.each_n_in_mod(mod), card))
 
     @classmethod
-    def each_prime_in_card_mod(cls, card, mod):
+    def each_prime_in_card_mod(cls, card, mod, canon=(True, True, False),
+                               default_m=5):
         """
         Yields every unique prime form with a given cardinality in the given
-        modulus
+        modulus in prime order, optionally for the given canonical operators
+        (T, I, M) and default m.
         """
-        for each in combinations(cls.each_n_in_mod(mod), card):
-            new = cls(each, mod=mod)
-            if new.prime == new:
-                yield new
+        return cls._each_int_in_mod(
+            tables.prime_ints(mod, canon, default_m, card), mod, canon,
+            default_m)
 
-    @property
-    def cardinality(self):
-        """Returns the cardinality of the given object."""
-        return len(self._pc_set)
+    @classmethod
+    def each_prime_in_database(cls, path, where='1', params=(), mod=12,
+                               canon=(True, True, False), default_m=5):
+        """
+        Yields the prime forms in an SQLite database written by
+        sator.database.export() that match an SQL WHERE clause, in prime
+        order, for the given modulus, canonical operators (T, I, M) and
+        default m. The clause may use ? placeholders for params.
+        Ex:
+            PCSet.each_prime_in_database('classes.db',
+                                         'card = 7 AND ds >= 2 AND ic6 = 0')
+        """
+        from sator import database
+        return cls._each_int_in_mod(
+            database.query(path, where, params, mod, canon, default_m), mod,
+            canon, default_m)
+
+    def sample_primes(self, count, card=None, weighted=False, seed=None):
+        """
+        Returns a list of count set-classes drawn at random from the modulus
+        of the given object, as given by its canonical operators or group,
+        optionally only those with a given cardinality. Each set-class is
+        equally likely, or with weighted=True, as likely as its orbit size.
+        The seed is an int, None or a random.Random (see sator.sample).
+        """
+        from sator import sample
+        if self._group is None:
+            return self.sample_primes_in_mod(count, self._mod, self.get_canon,
+                                             self._default_m, card, weighted,
+                                             seed)
+        return list(self._each_in_group(sample.group_primes(
+            count, self.canon_group(), card, weighted, seed)))
 
-    # Helper functions for prime()
-    def _t_rotations(self):
+    @classmethod
+    def sample_primes_in_mod(cls, count, mod, canon=(True, True, False),
+                             default_m=5, card=None, weighted=False,
+                             seed=None):
         """
-        Same as the public method, but enforces that the returned objects are
-        PCSets for use with the prime method.
+        Same as the instance method but takes the modulus, and optionally the
+        canonical operators (T, I, M) and default m. Use
+        sator.sample.primes() for the integer representations alone. Gives
+        shared FrozenPCSets when the pool is enabled.
         """
-        from sator.pcset import PCSet
-        return (PCSet(self.copy(rot)) for rot in [self._transpose(n) \
-                                                  for n in self.each_n()])
+        from sator import sample
+        return list(cls._each_int_in_mod(
+            sample.primes(count, mod, canon, default_m, card, weighted, seed),
+            mod, canon, default_m))
+
+    @classmethod
+    def sample_sets_in_mod(cls, count, mod, card=None, seed=None):
+        """
+        Returns a list of count sets drawn uniformly from a modulus,
+        optionally only those with a given cardinality. Use
+        sator.sample.sets() for the integer representations alone. Gives
+        shared FrozenPCSets when the pool is enabled.
+        """
+        from sator import pool, sample
+        integers = sample.sets(count, mod, card, seed)
+        if pool.provides(cls):
+            return [pool.get(integer, mod) for integer in integers]
+        return [cls(utils.fromint(integer), mod=mod) for integer in integers]
+
+    def prime_counts(self):
+        """
+        Returns a list of the number of set-classes of each cardinality (the
+        index of the list) in the modulus of the given object, as given by
+        its canonical operators or group. When these form a group, the counts
+        are found with Burnside's lemma (see AffineGroup.counts()) rather than
+        by enumerating the prime forms. Canonical operators that are not
+        closed under composition (such as T/I/M in mod 7) do not, so their
+        prime forms are enumerated instead.
+        """
+        if self._group is None:
+            return self.prime_counts_in_mod(self._mod, self.get_canon,
+                                            self._default_m)
+        return self.canon_group().counts()
 
-    def _i_rotations(self):
+    @classmethod
+    def prime_counts_in_mod(cls, mod, canon=(True, True, False), default_m=5):
         """
-        Same as the public method, but enforces that the returned objects are
-        PCSets for use with the prime method.
+        Same as the instance method but takes one positional arg as the
+        modulus, and optionally the canonical operators (T, I, M) and default
+        m. The sum of the list is the number of set-classes in the modulus,
+        which is always the number of prime forms each_prime_in_mod() yields
+        (see sator.groups.prime_counts).
         """
-        from sator.pcset import PCSet
-        return (PCSet(self.copy(rot)) for rot in [self._invert(n) \
-                                                  for n in self.each_n()])
+        return groups.prime_counts(mod, canon, default_m)
 
-    def _m_rotations(self):
+    @classmethod
+    def count_primes_in_card_mod(cls, card, mod, canon=(True, True, False),
+                                 default_m=5):
         """
-        Same as the public method, but enforces that the returned objects are
-        PCSets for use with the prime method.
+        Returns the number of prime forms each_prime_in_card_mod() would
+        yield, without enumerating them when the canonical operators form a
+        group (see sator.groups.count_primes).
         """
-        from sator.pcset import PCSet
-        return (PCSet(self.copy(rot)) for rot in [self._transpose_multiply(n) \
-                                                  for n in self.each_n()])
+        return groups.count_primes(mod, canon, default_m, card)
 
-    def _mi_rotations(self):
+    @property
+    def cardinality(self):
+        """Returns the cardinality of the given object."""
+        if self._storage == 'bitmask':
+            return utils.popcount(self._pitches)
+        return len(self._pc_set)
+
+    def _prime_of(self, integer):
+        """
+        Returns (prime, (n, m)) for an integer representation in the modulus
+        and with the canonical operators and default m of the given object,
+        where prime is the integer representation of its prime form.
         """
-        Same as the public method, but enforces that the returned objects are
-        PCSets for use with the prime method.
+        if self._group is not None:
+            return self.canon_group().prime_form(integer)
+        return tables.prime_form(integer, self._mod, self.get_canon,
+                                 self._default_m)
+
+    def _prime_set(self, integer):
+        """
+        Returns a PCSet in the modulus of the given object holding the prime
+        form of an integer representation.
         """
         from sator.pcset import PCSet
-        return (PCSet(self.copy(rot)) for rot in [self._transpose_multiply(n, self._default_m * -1) \
-                                                  for n in self.each_n()])
+        new = PCSet(mod=self._mod)
+        new.pitches = utils.fromint(self._prime_of(integer)[0])
+        return new
 
     @property
-    def _rotation_ints(self):
-        """
-        Returns a nested list with the interger representation for each object
-        returned from _rotations()
-        """
-        return [[utils.setint(pcs) for pcs in rotation] \
-            for rotation in self._rotations()]
-
-    def _rotations(self):
-        """
-        Returns a nested list of PCSet objects for each canonical TTO for a
-        given object.
-        """
-        def setify(pitches):
-            pcs = [pitch % self._mod for pitch in pitches]
-            result = list(set(pitches))
-            result.sort()
-            return result
-
-        result = []
-        if self._canon_t:
-            result.append(self._t_rotations())
-            if self._canon_i:
-                result.append(self._i_rotations())
-            if self._canon_m:
-                result.append(self._m_rotations())
-            if self._canon_i and self._canon_m:
-                result.append(self._mi_rotations())
-        else:
-            result.append([setify(self.pcs)])
-            if self._canon_i:
-                result.append([setify(self._invert())])
-            if self._canon_m:
-                result.append([setify(self._transpose_multiply(0))])
-        return result
+    def _prime_form(self):
+        """Returns (prime, (n, m)) for the given object. See _prime_of()"""
+        return self._prime_of(self.setint)
+
+    @property
+    def _lowest_pcint(self):
+        """
+        Returns the lowest integer representation of the set-class of the
+        given object, by which the tables of sator.const are keyed. This is
+        its pcint unless another ordering is used (see
+        sator.tables.ordering), in which case it is looked up in the table
+        of the setint ordering.
+        """
+        if self._group is not None or \
+                tables._ordering_name(self.get_canon) == 'setint':
+            return self.pcint
+        return tables.prime_form(self.setint, self._mod, self.get_canon,
+                                 self._default_m, 'setint')[0]
 
     @property
     def prime_operation(self):
@@ -241,20 +434,7 @@ class SetBase(SetRowBase):
         A property that returns (n, m) to perform on the given object via TnMm
         in order to obtain its prime form.
         """
-        low_vals =[min(zip(operation, count())) \
-            for operation in self._rotation_ints]
-        min_val = min(zip(low_vals, count()))
-        n = min_val[0][1]
-        oper = min_val[1]
-        if oper == 0:
-            m = 1
-        elif oper == 1:
-            m = self._mod - 1
-        elif oper == 2:
-            m = self._default_m
-        elif oper == 3:
-            m = self._mod - self._default_m
-        return (n, m)
+        return self._prime_form[1]
 
     @property
     def prime(self):
@@ -262,29 +442,36 @@ class SetBase(SetRowBase):
         Return a PCSet that represents the given object in prime form, taking
         into account its canonical TTO's (set these with .canon(T, I, M)).
         """
-        from sator.pcset import PCSet
-        n, m = self.prime_operation
-        return PCSet(self.copy(utils.transpose_multiply(self.pitches, n, m)))
+        return self._prime_set(self.setint)
 
     @property
     def mpartner(self):
         """
         Return a PCSet for the M-partner of the given object.
         """
-        from sator.pcset import PCSet
-        return PCSet(self._transpose_multiply().prime)
+        return self._prime_set(
+            utils.multiply_int(self.setint, self._default_m, self._mod))
 
     @staticmethod
-    def forte_name(fname):
+    def forte_name(fname, modulus=12):
         """
         A static method that returns a PCSet object with the fort-name provided
         as a string argument.
         Returns an empty PCSet if the argument is not a string with a valid
         Forte name.
+        In moduli other than 12, the names are the generated card-index names
+        given by forte.
         """
         from sator.pcset import PCSet
-        fset = utils.from_forte(fname)
-        new_set = PCSet()
+        if modulus != 12:
+            integer = tables.from_forte_name(fname, modulus)
+            fset = None if integer is None else utils.fromint(integer)
+        else:
+            fset = utils.from_forte(fname)
+            if fset:
+                # In the current ordering (see sator.tables.ordering)
+                fset = utils.fromint(tables.prime_form(utils.setint(fset))[0])
+        new_set = PCSet(mod=modulus)
         if fset:
             new_set.pitches = fset
         return new_set
@@ -293,42 +480,76 @@ class SetBase(SetRowBase):
     def forte(self):
         """
         Returns the Forte name for the given object.
+        In moduli other than 12, returns a generated name 'card-index', where
+        index is the position of the set-class among those with the same
+        cardinality in prime order (see sator.tables.forte_name).
         """
-        return utils.forte_name(self.pcint)
+        if self._mod == 12:
+            return utils.forte_name(self._lowest_pcint)
+        if self._group is not None:
+            integer = self.setint
+            return '{0}-{1}'.format(utils.popcount(integer),
+                                    self.canon_group().ordinal(integer))
+        return tables.forte_name(self.setint, self._mod, self.get_canon,
+                                 self._default_m)
 
     @property
     def literal_compliment(self):
         """Returns a PCSet of the literal compliment of the given object."""
         from sator.pcset import PCSet
-        return PCSet(self.copy([n for n in self.each_n() if n not in self.pcs]))
+        if self._storage == 'bitmask':
+            return self._copy_bits(~self._pitches)
+        return PCSet(self.copy([n for n in self.each_n() if n not in self._pc_set]))
 
     @property
     def abstract_compliment(self):
-        """Returns a PCSet of the abstract compliment of the given object."""
-        from sator.pcset import PCSet
-        return PCSet(self.literal_compliment.prime)
+        """
+        Returns a PCSet of the prime form of the abstract compliment of the
+        given object, as given by its canonical operators or group.
+        """
+        return self._prime_set(~self.setint & (2 ** self._mod - 1))
 
     @property
     def icv(self):
         """Returns the interval class vector of the given object."""
-        return utils.icv(self._unique_pcs, self._mod)
+        return utils.icv_int(self.setint, self._mod)
 
     @property
     def zpartner(self):
         """
         Property that returns the Z-partner of the given object if it exists,
-        otherwise returns None.
+        otherwise returns None. When there is more than one, returns the first
+        in prime order (see zpartners).
         """
-        if self._mod == 12:
-            zint = Z_PARTNERS.get(self.pcint, None)
-            if zint:
-                return self.copy(utils.fromint(zint))
-            else:
-                return
-        for each in self.each_card():
-            if each.icv == self.icv:
-                if each.prime._unique_pcs != self.prime._unique_pcs:
-                    return self.copy(each)
+        partners = self.zpartners
+        return partners[0] if partners else None
+
+    @property
+    def zpartners(self):
+        """
+        Property that returns a list of the prime forms of every set-class
+        that is Z-related to the given object, in prime order. These share its
+        interval class vector but are related to it by neither TnI nor its
+        canonical operators or group, so a set is never its own Z-partner, and
+        the inversion of a set is not its Z-partner when I is not canonical.
+        The prime forms are found in an index of the set-classes of the
+        modulus by ICV (see sator.tables.icv_index), which is built once per
+        cardinality.
+        """
+        if self._mod == 12 and self._lowest_pcint not in Z_PARTNERS:
+            return []
+        card = self.cardinality
+        if self._group is not None:
+            index = self.canon_group().icv_index(card)
+        else:
+            index = tables.icv_index(self._mod, self.get_canon,
+                                     self._default_m, card)
+        integer = self.setint
+        related = (self._prime_of(integer)[0], self._prime_of(
+            utils.multiply_int(integer, -1, self._mod))[0])
+        return [self._new(utils.fromint(prime)) \
+                for prime in index.get(tuple(self.icv), ()) \
+                if prime not in related]
 
     @property
     def invariance_vector(self):
@@ -336,7 +557,11 @@ class SetBase(SetRowBase):
         A property that returns the list of (n, m) pairs that produce an
         invariant set via TnMm
         """
-        return [(n, m) for n, m in self.each_tto() if self._transpose_multiply(n, m) == self]
+        if self._group is not None:
+            operations = self.canon_group().operations()
+        else:
+            operations = self.each_tto()
+        return [(n, m) for n, m in operations if self._is_invariant(n, m)]
 
     @property
     def ds(self):
@@ -347,10 +572,38 @@ class SetBase(SetRowBase):
         total = 0
         for m in (1, -1):
             for n in self.each_n():
-                if self._transpose_multiply(n, m) == self:
+                if self._is_invariant(n, m):
                     total += 1
         return total
 
+    def _is_invariant(self, sub_n, sub_m):
+        """
+        Returns True if TnMm of the given object is equal to it. Unordered
+        PCSets without duplicates are compared by their integer
+        representation.
+        """
+        if self._ordered or self._multiset or self.pitchset:
+            return self._transpose_multiply(sub_n, sub_m) == self
+        integer = self.setint
+        return utils.rotate(utils.multiply_int(integer, sub_m, self._mod),
+                            sub_n, self._mod) == integer
+
+    @property
+    def orbit_size(self):
+        """
+        Returns the number of distinct sets in the set-class of the given
+        object, i.e. the number of sets its canonical TTO's map it to.
+        """
+        integer = self.setint
+        if self._group is not None:
+            return self.canon_group().orbit_size(integer)
+        each_n = list(self.each_n()) if self._canon_t else [0]
+        operations = utils.canonical_operations(self._mod, self.get_canon,
+                                                self._default_m)
+        return len(set([utils.rotate(utils.multiply_int(integer, m, self._mod),
+                                     n, self._mod) \
+                        for m in operations for n in each_n]))
+
     def m_vector(self, m):
         """
         Find David Lewin's M-vector.
@@ -364,7 +617,7 @@ class SetBase(SetRowBase):
         from sator.pcset import PCSet
         pc_set = self._pc_set
         vectors = {}
-        for index, each in enumerate(self.__class__.each_card_in_mod(m, self._mod)):
+        for index, each in enumerate(PCSet.each_card_in_mod(m, self._mod)):
             e_prime = each.pcint
             old_value = vectors.get(e_prime, 0)
             to_add = 1 if pc_set.issuperset(each._pc_set) else 0
@@ -379,7 +632,7 @@ class SetBase(SetRowBase):
         which limits the supersets to those with a cardinality <= the limit.
         With no argument, returns all supersets.
         """
-        for sup in utils.supersets(self.ppc, self._mod, limit):
+        for sup in utils.supersets(self._ppc, self._mod, limit):
             yield self.copy(sup)
 
     def superprimes(self, limit=0):
@@ -387,9 +640,8 @@ class SetBase(SetRowBase):
         Yields the supersets of the given object which have a unique set-class.
         Takes an optional limit argument with the same behavior as supersets()
         """
-        from sator.pcset import PCSet
         for sup in self.supersets(limit):
-            yield PCSet(self.copy(utils.fromint(sup.pcint)))
+            yield self.fromint(sup.pcint, self._mod)
 
     def subsets(self, limit=0):
         """
@@ -397,7 +649,7 @@ class SetBase(SetRowBase):
         which limits the subsets to those with a cardinality >= the limit.
         With no argument, returns all subsets.
         """
-        for sub in utils.subsets(self.ppc, limit):
+        for sub in utils.subsets(self._ppc, limit):
             yield self.copy(sub)
 
     def subprimes(self, limit=0):
@@ -405,9 +657,8 @@ class SetBase(SetRowBase):
         Yields the subsets of the given object which have a unique set-class.
         Takes an optional limit argument with the same behavior as subsets().
         """
-        from sator.pcset import PCSet
         for sub in self.subsets(limit):
-            yield PCSet(self.copy(utils.fromint(sub.pcint)))
+            yield self.fromint(sub.pcint, self._mod)
 
     class OnlySetableMethod(Exception):
         """
@@ -416,19 +667,16 @@ class SetBase(SetRowBase):
         pass
 
     def args_are_sets(f, *args, **kwargs):
-        """ Decorator to help with set methods. Ensures that args are sets"""
+        """
+        Decorator to help with set methods. Ensures that args are set-like.
+        The args are only checked, not converted, so that bitmask objects
+        reach the method as they are.
+        """
         def _(*args, **kwargs):
             from sator.pcset import PCSet
             from sator.pset import PSet
-            ints = set()
             for arg in args[1:]:
-                if isinstance(arg, (PCSet, PSet)):
-                    arg = arg._pc_set
-                    continue
-                if isinstance(arg, (list, tuple)):
-                    arg = set(arg)
-                    continue
-                if isinstance(arg, set):
+                if isinstance(arg, (PCSet, PSet, list, tuple, set)):
                     continue
                 err_msg = 'Only lists, tuples, sets, PSet, and PCSet objects can be used as arguments for this method'
                 raise args[0].OnlySetableMethod(err_msg)
@@ -443,6 +691,8 @@ class SetBase(SetRowBase):
         Return an instance that represents the union of the current PSet
         or PCSet and another as the first and only positional argument.
         """
+        if self._storage == 'bitmask':
+            return self._copy_bits(self._pitches | self._bits_of(other))
         return self.copy(self._pc_set.union(other))
 
     @args_are_sets
@@ -451,6 +701,8 @@ class SetBase(SetRowBase):
         Return an instance that represents the intersection of the current
         PSet or PCSet and another as the first and only positional argument.
         """
+        if self._storage == 'bitmask':
+            return self._copy_bits(self._pitches & self._bits_of(other))
         return self.copy(self._pc_set.intersection(other))
 
     @args_are_sets
@@ -459,6 +711,8 @@ class SetBase(SetRowBase):
         Return an instance that represents the difference of the current
         PSet or PCSet and another as the first and only positional argument.
         """
+        if self._storage == 'bitmask':
+            return self._copy_bits(self._pitches & ~ self._bits_of(other))
         return self.copy(self._pc_set.difference(other))
 
     @args_are_sets
@@ -468,6 +722,8 @@ class SetBase(SetRowBase):
         current PSet or PCSet and another as the first and only positional
         argument.
         """
+        if self._storage == 'bitmask':
+            return self._copy_bits(self._pitches ^ self._bits_of(other))
         return self.copy(self._pc_set.symmetric_difference(other))
 
     @args_are_sets
@@ -476,6 +732,9 @@ class SetBase(SetRowBase):
         Return True if the current PSet or PCSet is a subset of another object
         taken as the first and only positional argument, otherwise False.
         """
+        if self._storage == 'bitmask':
+            bits = self._bits_of(other)
+            return self._pitches & ~bits == 0
         return self._pc_set.issubset(other)
 
     @args_are_sets
@@ -484,6 +743,9 @@ class SetBase(SetRowBase):
         Return True if the current PSet or PCSet is a superset of another
         object taken as the first and only positional argument, otherwise False
         """
+        if self._storage == 'bitmask':
+            bits = self._bits_of(other)
+            return bits & ~self._pitches == 0
         return self._pc_set.issuperset(other)
 
     @args_are_sets
@@ -492,4 +754,7 @@ class SetBase(SetRowBase):
         Return True if the current PSet or PCSet is disjoint with another
         object taken as the first and only positional argument, otherwise False
         """
+        if self._storage == 'bitmask':
+            bits = self._bits_of(other)
+            return self._pitches & bits == 0
         return self._pc_set.isdisjoint(other)
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+from array import array
 from itertools import permutations
 
 # Force Python 2.X to use xrange
@@ -10,81 +11,85 @@ except:
 import sator.utils as utils
 from sator.const import MAX_OCTAVE
 
+# Bits of the _flags slot, which packs the boolean settings of an object
+ORDERED = 1
+MULTISET = 2
+CANON_T = 4
+CANON_I = 8
+CANON_M = 16
+FROZEN = 32
+
+
+def flag(bit):
+    """Returns a property for one boolean setting kept in the _flags slot"""
+    def fget(self):
+        return True if self._flags & bit else False
+    def fset(self, value):
+        if value:
+            self._flags |= bit
+        else:
+            self._flags &= ~bit
+    return property(fget, fset)
+
+
 class SetRowBase(object):
     """Base class for PC/pitch sets and tone rows"""
 
-    pitches = []
-    _mod = 12
-    _default_m = 5
-    _ordered = False
-    _multiset = False
+    __slots__ = ('_pitches', '_mod', '_default_m', '_flags', '_storage',
+                 '_cache', '__weakref__')
+
+    _default_flags = 0
+    _storage_types = ('list',)
+
+    _ordered = flag(ORDERED)
+    _multiset = flag(MULTISET)
 
     #Overrides
     def __init__(self, *args, **kwargs):
+        self._flags = self._default_flags
+        self._cache = None
+        self._storage = 'list'
+        self._pitches = []
+        self._default_m = 5
         modulus = kwargs.pop('mod', 12)
         self.mod(modulus)
         ordered = kwargs.pop('ordered', self._ordered)
         self.ordered(ordered)
         multiset = kwargs.pop('multiset', self._multiset)
         self.multiset(multiset)
-        self[:] = []
-        results = []
+        storage = kwargs.pop('storage', self._storage)
+        pitches = []
         for arg in args:
-            results += self.__add__(arg, internal=True)
-        # Limit the pitches to within max_octave octaves from 0
-        new_results = []
-        for result in results:
-            new = abs(result) % (MAX_OCTAVE * self.mod())
-            if result < 0:
-                new = new * -1
-            new_results.append(new)
-        self.pitches = new_results
-        if not self._multiset:
-            self[:] = self._rm_dupes(self.pitches)
+            pitches.extend(self._as_pitches(arg))
+        self.pitches = self._normalize(pitches)
+        if storage != self._storage:
+            self.storage(storage)
 
-    def __add__(self, other, **kwargs):
-        internal = kwargs.get('internal', False)
-        ps = other
-        if isinstance(other, SetRowBase):
-            ps = other.pitches[:]
-        if isinstance(other, int):
-            ps = [other]
-        if isinstance(other, (tuple, list)):
-            ps = list(other)
-        if isinstance(other, set):
-            ps = [int(num) for num in other]
-        ps = self.pitches + ps
+    def __add__(self, other):
+        ps = self.pitches + self._as_pitches(other)
         if not self._multiset:
             ps = self._rm_dupes(ps)
-        # If initializing, returning an instance creates infinite recursion
-        ps = self.copy(ps) if not internal else ps
-        return ps
+        return self.copy(ps)
 
     def __radd__(self, other):
         return self.__add__(other)
 
     def __eq__(self, other):
         """Compare equality between a ToneRow/PSet/PCSet and another object"""
-        try:
-            that = other.copy()
-        except AttributeError:
-            try:
-                that = other[:]
-            except TypeError:
-                that = [other]
+        if isinstance(other, SetRowBase):
+            if self._storage == 'bitmask' and other._storage == 'bitmask':
+                return self._pitches == other._pitches
+            return self._key == other._key
         #Are we comparing pitches as ordered lists or set membership?
-        if not self._ordered and isinstance(other, (tuple, list)):
-            that = set(that)
-        #Is the other a PSet/PCSet or builtin ?
-        if isinstance(that, SetRowBase):
-            return self.ppc == that.ppc
-        if isinstance(that, (tuple, list)):
-            return self.ppc == list(that)
-        if isinstance(that, set):
-            return set(self.ppc) == that
-        else:
+        if isinstance(other, (tuple, list)):
+            if not self._ordered:
+                return set(self._key) == set(other)
+            return self._key == tuple(other)
+        if isinstance(other, set):
+            return set(self._key) == other
+        if hasattr(other, 'copy') or hasattr(other, '__getitem__'):
             return NotImplemented
-        return False
+        return self._key == (other,)
 
     def __ne__(self, other):
         result = self.__eq__(other)
@@ -93,54 +98,128 @@ class SetRowBase(object):
         return not result
 
     def __getitem__(self, key):
-        try:
-            l = []
-            l.extend(self.ppc[key])
-            return self.copy(l)
-        except TypeError:
-            l = [self.ppc[key]]
-            return self.copy(l)
+        """
+        Returns a read-only view of the pitches or pcs (as given by ppc) at an
+        index or slice. The view shares the data of the given object rather
+        than copying it. The view can not be changed in place, so s[:].t(n)
+        raises ImmutableObject, but copy(), thaw(), arithmetic and operations
+        on the view return mutable objects.
+        """
+        from sator.frozen import view
+        return view(self, key)
 
     def __setitem__(self, key, value):
         if isinstance(value, int):
-            new = abs(value) % (MAX_OCTAVE * self.mod())
-            if value < 0:
-                new = new * -1
-            value = new
-        self.pitches[key] = value
+            value = self._clamp(value, MAX_OCTAVE * self._mod)
+        pitches = self.pitches
+        pitches[key] = value
+        self.pitches = pitches
+
+    def __contains__(self, item):
+        if self._storage == 'bitmask':
+            try:
+                return 0 <= item < self._mod and bool(self._pitches >> item & 1)
+            except TypeError:
+                return False
+        return item in self._ppc
 
     def __iter__(self):
-        for p in self.ppc:
+        for p in self._ppc:
             yield p
 
     def __len__(self):
-        return len(self.ppc)
+        return len(self._ppc)
 
     def __repr__(self):
-        return str(self.ppc)
+        return str(self._ppc)
 
     def __copy__(self):
-        return copy(self)
+        return self.copy()
+
+    def __getstate__(self):
+        return (self._pitches, self._mod, self._default_m, self._flags,
+                self._storage)
+
+    def __setstate__(self, state):
+        self._pitches, self._mod, self._default_m, self._flags, \
+            self._storage = state
+        self._cache = None
 
     def copy(self, pitches=None, **kwargs):
         """Use to copy a ToneRow/PSet/PCSet with all data attributes."""
         if pitches is None:
+            if not kwargs:
+                # The pitches are already normalized, so skip __init__
+                new = self._blank()
+                new._pitches = self._pitches if self._storage == 'bitmask' \
+                    else self._pitches[:]
+                return new
             pitches = self.pitches
         new_kwargs = {
             'mod': self._mod,
             'ordered': self._ordered,
             'multiset': self._multiset,
+            'storage': self._storage if self._storage != 'view' else 'list',
         }
         new_kwargs.update(kwargs or {})
         new = self.__class__(pitches, **new_kwargs)
         if hasattr(new, 'canon'):
-            new.canon(self._canon_t, self._canon_i, self._canon_m)
+            new._canon_t = self._canon_t
+            new._canon_i = self._canon_i
+            new._canon_m = self._canon_m
+            new._group = self._group
         new._default_m = self._default_m
         return new
 
+    def _blank(self, cls=None):
+        """
+        Returns a new object with the class (or cls) and settings of the given
+        one and no pitches, skipping __init__. For internal use only.
+        """
+        cls = cls or self.__class__
+        new = cls.__new__(cls)
+        new._mod = self._mod
+        new._default_m = self._default_m
+        new._flags = self._flags
+        new._storage = self._storage
+        new._cache = None
+        return new
+
+    def _new(self, pitches):
+        """
+        Trusted constructor for internal use. Returns a new object with the
+        class and settings of the given one, holding a list of pitches that are
+        already within MAX_OCTAVE and free of duplicates (unless the object is
+        a multiset). The list is kept as is rather than copied.
+        """
+        new = self._blank()
+        new._store(pitches)
+        return new
+
+    def _new_unclamped(self, pitches):
+        """
+        Same as _new, but for the results of operations such as Tn, which may
+        move pitches beyond MAX_OCTAVE. These are only normalized if needed.
+        """
+        limit = MAX_OCTAVE * self._mod
+        if pitches and (max(pitches) >= limit or min(pitches) <= -limit):
+            pitches = self._normalize(pitches)
+        return self._new(pitches)
+
+    def freeze(self):
+        """
+        Returns an immutable, hashable copy of the given object with the same
+        pitches and settings.
+        """
+        from sator.frozen import freeze
+        return freeze(self)
+
     class InvalidModulus(Exception):
         pass
 
+    class InvalidStorage(Exception):
+        pass
+
     def mod(self, new_mod=None):
         """
         Takes one argument as the new modulus of the system.
@@ -148,7 +227,13 @@ class SetRowBase(object):
         """
         if new_mod is not None:
             if new_mod > 0 and new_mod < 32:
+                if self._storage == 'bitmask':
+                    # Bits are only meaningful for one modulus, so re-encode
+                    pitches = self.pitches
+                    self._mod = new_mod
+                    self.pitches = pitches
                 self._mod = new_mod
+                self._changed()
             else:
                 raise self.InvalidModulus('The modulus must be > 0 and < 32')
         else:
@@ -173,6 +258,9 @@ class SetRowBase(object):
         """
         if value is not None:        
             self._multiset = True if value else False
+            if self._multiset and self._storage == 'bitmask':
+                self.storage('list')
+            self._changed()
         else:
             return self._multiset
 
@@ -184,18 +272,133 @@ class SetRowBase(object):
         """
         if value is not None:
             self._ordered = True if value else False
+            if self._ordered and self._storage == 'bitmask':
+                self.storage('list')
+            self._changed()
         else:
             return self._ordered
 
+    def storage(self, value=None):
+        """
+        Takes one argument as the storage engine for the object's pitches.
+        ('list' is the default for all objects. PCSets can also use 'bitmask',
+        which keeps the unique pcs as the bits of a single integer. Bitmask
+        storage is always unordered and never a multiset. PSets and ToneRows
+        can also use 'array', which keeps the pitches in an array of 16 bit
+        signed ints that is exposed through the buffer property.)
+        Without an argument, returns the current setting.
+        """
+        if value is None:
+            return self._storage
+        if value not in self._storage_types:
+            msg = '{0} storage is not available for {1} objects'.format(
+                value, self.__class__.__name__)
+            raise self.InvalidStorage(msg)
+        if value == self._storage:
+            return
+        pitches = self.pitches
+        if value == 'bitmask':
+            self._ordered = False
+            self._multiset = False
+            self._pitches = 0
+        self._storage = value
+        self.pitches = pitches
+
+    @property
+    def pitches(self):
+        """
+        Returns a copy of the pitches of the current set/row as a list. Assign
+        a new list (or use item assignment) to change them, so that cached
+        views built from the pitches are updated.
+        """
+        if self._storage == 'bitmask':
+            return utils.fromint(self._pitches)
+        if self._storage == 'array':
+            return self._pitches.tolist()
+        if self._storage == 'view':
+            ppc, key = self._pitches
+            return ppc[key] if isinstance(key, slice) else [ppc[key]]
+        # Changing the list in place would leave the cached views stale
+        return self._pitches[:]
+
+    @pitches.setter
+    def pitches(self, value):
+        self._store(value)
+        self._changed()
+
+    def _store(self, pitches):
+        """Keep a list of pitches in the object's storage format"""
+        if self._storage == 'bitmask':
+            self._pitches = utils.setint(
+                set([pitch % self._mod for pitch in pitches]))
+        elif self._storage == 'array':
+            self._pitches = array('h', pitches)
+        else:
+            self._pitches = pitches
+
+    @property
+    def buffer(self):
+        """
+        Returns a read-only memoryview of the pitches as 16 bit signed ints,
+        which can be handed to anything that supports the buffer protocol,
+        such as numpy.asarray. With 'array' storage the view shares the
+        object's memory, otherwise the pitches are copied into a new array.
+        Before Python 3.8, which can not make a view read-only, this returns
+        a copy of the pitches as an array instead.
+        """
+        if self._storage == 'array':
+            pitches = self._pitches
+        else:
+            pitches = array('h', self.pitches)
+        try:
+            return memoryview(pitches).toreadonly()
+        except (AttributeError, TypeError):
+            # Python 2 can not view arrays, and neither has toreadonly()
+            return array('h', pitches)
+
+    def _changed(self):
+        """
+        Drop the cached views of the object. Called whenever its pitches or
+        settings change.
+        """
+        self._cache = None
+
+    def cached_view(f):
+        """
+        Decorator for views derived from an object's pitches and settings.
+        The value is built on first use and kept until the object changes, so
+        callers must not modify it in place.
+        """
+        name = f.__name__
+        def _(self):
+            cache = self._cache
+            if cache is None:
+                cache = self._cache = {}
+            try:
+                return cache[name]
+            except KeyError:
+                value = cache[name] = f(self)
+                return value
+        _.__name__ = name
+        _.__doc__ = f.__doc__
+        return _
+
     @property
     def pcs(self):
         """Returns the pitch classes of the current set/row"""
+        return self._pcs[:]
+
+    @property
+    @cached_view
+    def _pcs(self):
+        """Cached pitch classes for internal use"""
         return [pitch % self._mod for pitch in self.pitches]
 
     @property
+    @cached_view
     def _pc_set(self):
         """Returns pitch classes as a Python set for internal use"""
-        return set(self.pcs)
+        return set(self._pcs)
 
     @property
     def _pitch_set(self):
@@ -205,21 +408,36 @@ class SetRowBase(object):
     @property
     def uo_pcs(self):
         """Returns unordered pitch classes in ascending order"""
-        return sorted(self.pcs[:])
+        return self._uo_pcs[:]
+
+    @property
+    @cached_view
+    def _uo_pcs(self):
+        """Cached unordered pitch classes for internal use"""
+        return sorted(self._pcs)
 
     @property
+    @cached_view
     def _unique_pcs(self):
         """
         Returns the unique, unordered pitch classes in ascending order. These
         are guarnteed to be unique regardless of rather or not the object is a
         multiset.
         """
+        if self._storage == 'bitmask':
+            return utils.fromint(self._pitches)
         return sorted(list(self._pc_set))
 
     @property
     def uo_pitches(self):
         """Returns the unordered pitches in ascending order"""
-        return sorted(self.pitches[:])
+        return self._uo_pitches[:]
+
+    @property
+    @cached_view
+    def _uo_pitches(self):
+        """Cached unordered pitches for internal use"""
+        return sorted(self.pitches)
 
     @property
     def ppc(self):
@@ -227,13 +445,19 @@ class SetRowBase(object):
         Returns the pitches or pcs of a ToneRow, PCSet, or PSet taking into
         account the ordered and multiset settings.
         """
+        return self._ppc[:]
+
+    @property
+    @cached_view
+    def _ppc(self):
+        """Cached ppc for internal use"""
         #Ordered?
         if self._ordered:
             pitches = self.pitches
-            pcs = self.pcs
+            pcs = self._pcs
         else:
-            pitches = self.uo_pitches
-            pcs = self.uo_pcs
+            pitches = self._uo_pitches
+            pcs = self._uo_pcs
         #PC/Pitch Set?
         if getattr(self, 'pitchset', False):
             ppc = pitches
@@ -242,13 +466,61 @@ class SetRowBase(object):
         #Multiset?
         if not self._multiset:
             ppc = self._rm_dupes(ppc)
-        return ppc
+        return list(ppc)
+
+    @property
+    @cached_view
+    def _key(self):
+        """
+        Returns the ppc as a tuple. Two objects are equal when their keys are
+        equal, so the key follows the ordered, multiset and pitch vs. pc
+        settings of the object.
+        """
+        return tuple(self._ppc)
 
     def _rm_dupes(self, ps):
-        """Remove all duplicates of a given pitch or pitch class from a list"""
-        new = []
-        [new.insert(ps.index(num), num) for num in ps[:] if num not in new]
-        return new
+        """
+        Remove all duplicates of a given pitch or pitch class from a list,
+        keeping the first of each in order.
+        """
+        seen = set()
+        add = seen.add
+        return [num for num in ps if not (num in seen or add(num))]
+
+    def _normalize(self, pitches):
+        """
+        Returns a list of pitches limited to within MAX_OCTAVE octaves from 0,
+        without duplicates unless the object is a multiset.
+        """
+        limit = MAX_OCTAVE * self._mod
+        pitches = [self._clamp(pitch, limit) for pitch in pitches]
+        if not self._multiset:
+            pitches = self._rm_dupes(pitches)
+        return pitches
+
+    @staticmethod
+    def _clamp(pitch, limit):
+        """Limit a pitch to within limit of 0, keeping its sign"""
+        if pitch < 0:
+            return -(-pitch % limit)
+        return pitch % limit
+
+    @staticmethod
+    def _as_pitches(other):
+        """
+        Returns a new list of pitches from an int, list, tuple, set or another
+        ToneRow/PSet/PCSet.
+        """
+        if isinstance(other, SetRowBase):
+            return other.pitches
+        if isinstance(other, int):
+            return [other]
+        if isinstance(other, set):
+            return [int(num) for num in other]
+        if hasattr(other, 'tolist'):
+            # array.array and numpy arrays
+            return other.tolist()
+        return list(other)
 
     def each_n(self):
         """
@@ -280,21 +552,28 @@ class SetRowBase(object):
         A generator that yields ordered objects that represent each
         permutation of the given object.
         """
-        for each in permutations(self[:]):
-            yield self.copy(each, ordered=True)
+        for each in permutations(self._ppc):
+            new = self._blank()
+            new._ordered = True
+            if new._storage == 'bitmask':
+                new._storage = 'list'
+            new._store(list(each))
+            yield new
 
     def _transpose(self, sub_n=0):
-        return self.copy(utils.transpose(self.pitches, sub_n))
+        return self._new_unclamped(utils.transpose(self.pitches, sub_n))
 
     def _invert(self, sub_n=0):
-        return self.copy(utils.invert(self.pitches, sub_n))
+        return self._new_unclamped(utils.invert(self.pitches, sub_n))
 
     def _transpose_multiply(self, sub_n=0, sub_m=0):
         if not sub_m:
             sub_m = self._default_m
         result = [pc % self._mod for pc in \
-                  utils.transpose_multiply(self.pcs, sub_n, sub_m)]
-        return self.copy(result)
+                  utils.transpose_multiply(self._pcs, sub_n, sub_m)]
+        if not self._multiset:
+            result = self._rm_dupes(result)
+        return self._new(result)
 
     def t(self, sub_n):
         """Transpose the object in place by the argument provided."""
@@ -313,8 +592,7 @@ class SetRowBase(object):
         Returns a list of objects for each possible transposition of the given
         object.
         """
-        return [self.copy(rot) for rot in [self._transpose(n) \
-                                           for n in self.each_n()]]
+        return [self._transpose(n) for n in self.each_n()]
 
     @property
     def i_rotations(self):
@@ -322,8 +600,7 @@ class SetRowBase(object):
         Returns a list of objects for each possible transposition of the given
         object after inversion.
         """
-        return [self.copy(rot) for rot in [self._invert(n) \
-                                           for n in self.each_n()]]
+        return [self._invert(n) for n in self.each_n()]
 
     @property
     def m_rotations(self):
@@ -331,8 +608,7 @@ class SetRowBase(object):
         Returns a list of objects for each possible transposition of the given
         object after M.
         """
-        return [self.copy(rot) for rot in [self._transpose_multiply(n) \
-                                           for n in self.each_n()]]
+        return [self._transpose_multiply(n) for n in self.each_n()]
 
     @property
     def mi_rotations(self):
@@ -340,8 +616,8 @@ class SetRowBase(object):
         Returns a list of objects for each possible transposition of the given
         object after MI.
         """
-        return [self.copy(rot) for rot in [self._transpose_multiply(n, self._default_m * -1) \
-                                           for n in self.each_n()]]
+        return [self._transpose_multiply(n, self._default_m * -1) \
+                for n in self.each_n()]
 
     @property
     def all_rotations(self):
@@ -354,6 +630,8 @@ class SetRowBase(object):
 class PCBase(object):
     """Base class for Tone rows and PC sets"""
 
+    __slots__ = ()
+
     def m(self, sub_n=0):
         """
         Perform M on the object in place. If an argument is provided, also
@@ -5,11 +5,13 @@ Module for similarity relations/functions between two pitch or pitch class sets
 
 from __future__ import division
 
+import sator.utils as utils
+
 
 """Functions for determining if the two sets are m, z, or c partners"""
 
 def z(a, b):
-    return a.zpartner == b.prime
+    return b.prime in a.zpartners
 
 def c(a, b):
     return a.abstract_compliment == b.prime
@@ -47,10 +49,10 @@ def iv(a, b):
     """
     check_mod(a, b)
     ivect = dict([(n, 0) for n in a.each_n()])
-    for pc in a.uo_pcs:
+    for pc in a._uo_pcs:
         for n in a.each_n():
             lookfor = (pc + n) % a.mod()
-            if lookfor in b.pcs:
+            if lookfor in b._pc_set:
                 ivect[n] += 1
     return list(ivect.values())
 
@@ -61,8 +63,7 @@ def sim(a, b):
     - Robert Morris SIM(a, b)
     """
     check_mod(a, b)
-    # Skip the first interval class, which is the cardinality.
-    return sum([abs(ic[0] - ic[1]) for ic in zip(a.icv[1:], b.icv[1:])])
+    return sim_icvs(a.icv, b.icv)
 
 
 def asim(a, b, rational=False):
@@ -77,8 +78,35 @@ def asim(a, b, rational=False):
     - Robert Morris ASIM(a, b)
     """
     check_mod(a, b)
+    return asim_icvs(a.icv, b.icv, rational)
+
+
+"""Similarity functions of interval class vectors"""
+def sim_icvs(a, b):
+    """
+    Same as sim(), but takes two interval class vectors. Either may also be
+    a numpy matrix with one icv per row, such as utils.icv_batch() gives,
+    and then returns an array of the SIM of each row.
+    """
+    if utils._is_ndarray(a) or utils._is_ndarray(b):
+        a, b = utils.numpy.asarray(a), utils.numpy.asarray(b)
+        return utils.numpy.abs(a[..., 1:] - b[..., 1:]).sum(axis=-1)
+    # Skip the first interval class, which is the cardinality.
+    return sum([abs(ic[0] - ic[1]) for ic in zip(a[1:], b[1:])])
+
+
+def asim_icvs(a, b, rational=False):
+    """
+    Same as asim(), but takes two interval class vectors, or numpy matrices
+    of them as for sim_icvs().
+    """
+    if utils._is_ndarray(a) or utils._is_ndarray(b):
+        a, b = utils.numpy.asarray(a), utils.numpy.asarray(b)
+        sim = utils.numpy.abs(a[..., 1:] - b[..., 1:]).sum(axis=-1)
+        asim = (a[..., 1:] + b[..., 1:]).sum(axis=-1)
+        return (sim, asim) if rational else sim / asim
     sim = asim = 0
-    for ic in zip(a.icv[1:], b.icv[1:]):
+    for ic in zip(a[1:], b[1:]):
         sim += abs(ic[0] - ic[1])
         asim += ic[0] + ic[1]
     return (sim, asim) if rational else sim / asim
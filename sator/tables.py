@@ -0,0 +1,589 @@
+#!/usr/bin/env python
+"""
+Lookup tables of set-class data for each modulus.
+
+Each table maps every integer representation of a PC set in a modulus to the
+integer representation of its prime form and the (n, m) that reaches it, for
+one combination of canonical operators and default m.
+
+Tables are read from a binary file in the cache directory (see cache_dir())
+when one has been built, which is memory mapped so that opening it is
+immediate and its pages are shared between processes. Otherwise tables are
+built in memory on first use for moduli up to MAX_MOD, since a table has
+2 ** mod entries. Larger moduli without a table file use utils.prime_form,
+and keep its results in a least recently used cache keyed by modulus,
+canonical operators, default m and set. Use cache_size() and cache_info() to
+size and inspect it. The lists of prime forms given by prime_ints() and the
+indexes of prime forms by interval class vector given by icv_index(), which
+find Z-partners, cover a whole modulus and are costly to rebuild, so they
+are kept apart from that cache until clear() is called.
+
+Ordinal tables map every integer representation to the position of its
+set-class among the prime forms of its cardinality, in prime order, which
+gives the generated card-index names of forte_name(). They are stored in the
+same way as prime tables.
+
+The prime form of a set-class is its lowest integer representation by
+default. Use ordering() to choose another rule, such as Forte's, from
+ORDERINGS. Each ordering has its own tables, files and cached results, so
+the choice adds nothing to the cost of a lookup.
+
+Build table files for a range of moduli with:
+
+    python -m sator.tables 13 24
+
+Pass the canonical operators as a third argument to build tables for other
+set-class types, e.g. T or TIM (the default is TI).
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+import sator.utils as utils
+from sator.cache import LRUCache
+
+# Force Python 2.X to use xrange
+try:
+    range = xrange
+except:
+    pass
+
+MAX_MOD = 14
+
+# Table files start with a header of the magic string, the format version,
+# the modulus, canonical operators (as bits of T, I, M), default m and byte
+# order, followed by arrays of the primes (I), m's (h) and n's (B), or for
+# ordinal tables an array of the ordinals (I).
+MAGIC = b'SATR'
+ORDINALS_MAGIC = b'SATN'
+VERSION = 1
+HEADER = struct.Struct('=4sHBBhc5x')
+BYTEORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+# Each ordering's key function for utils.prime_form, where None orders prime
+# forms by their integer representations. These are the same as Rahn's.
+ORDERINGS = {
+    'setint': None,
+    'rahn': None,
+    'forte': utils.forte_key,
+}
+
+_tables = {}
+_ordinal_tables = {}
+_results = LRUCache(65536)
+_mod_results = {}
+_cache_dir = None
+_ordering = 'setint'
+
+
+class InvalidOrdering(Exception):
+    pass
+
+
+def _key(mod, canon, default_m):
+    return (mod, tuple([True if value else False for value in canon]),
+            default_m)
+
+
+def ordering(name=None):
+    """
+    Takes one argument as the name of the rule in ORDERINGS used to choose
+    the prime form of each set-class:
+
+        setint - the lowest integer representation (the default)
+        rahn - Rahn's rule, which packs sets to the right and always gives
+            the same prime forms as setint
+        forte - Forte's rule, which packs sets to the left (see
+            utils.forte_key). These differ from setint for 5-20, 6-Z29,
+            6-31, 7-Z18, 7-20 and 8-26.
+
+    Orderings only apply when T is canonical, and not to canonical groups
+    (see sator.groups). Frozen and pooled sets cache their prime forms, so
+    set the ordering before making them.
+    Without an argument, returns the name of the current ordering.
+    """
+    global _ordering
+    if name is None:
+        return _ordering
+    if name not in ORDERINGS:
+        raise InvalidOrdering('{0} is not an ordering'.format(name))
+    _ordering = name
+
+
+def register_ordering(name, key):
+    """
+    Adds an ordering to ORDERINGS, given a function taking an integer
+    representation and modulus which returns the value to minimize.
+    """
+    ORDERINGS[name] = key
+
+
+def _ordering_key(canon, name=None):
+    """
+    Returns the key function of an ordering (by default the current one) for
+    the canonical operators, or None to order by integer.
+    """
+    return ORDERINGS[name or _ordering] if canon[0] else None
+
+
+def _ordering_name(canon, name=None):
+    """
+    Returns the name of an ordering (by default the current one), or
+    'setint' for any ordering which has the same prime forms.
+    """
+    if _ordering_key(canon, name) is None:
+        return 'setint'
+    return name or _ordering
+
+
+def _cache_key(mod, canon, default_m, ordering=None):
+    """
+    Returns the key of the tables and cached results for a modulus,
+    canonical operators, default m and ordering (by default the current one).
+    """
+    key = _key(mod, canon, default_m)
+    return key + (_ordering_name(key[1], ordering),)
+
+
+def cache_dir(path=None):
+    """
+    Takes one argument as the directory for table files. Without an
+    argument, returns the current directory, which defaults to the
+    SATOR_CACHE_DIR environment variable or else a sator directory in the
+    user's cache directory.
+    """
+    global _cache_dir
+    if path is not None:
+        _cache_dir = path
+        clear()
+        return
+    if _cache_dir is not None:
+        return _cache_dir
+    if os.environ.get('SATOR_CACHE_DIR'):
+        return os.environ['SATOR_CACHE_DIR']
+    cache_home = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'sator')
+
+
+def filename(mod=12, canon=(True, True, False), default_m=5, kind='primes',
+             ordering=None):
+    """
+    Returns the path of the table file for a modulus, canonical operators
+    (T, I, M) and default m. The kind is 'primes' or 'ordinals'. Orderings
+    (by default the current one) other than setint add their name.
+    """
+    mod, canon, default_m = _key(mod, canon, default_m)
+    letters = ''.join([letter for letter, value in zip('TIM', canon) \
+                       if value]) or 'none'
+    ordering_name = _ordering_name(canon, ordering)
+    if ordering_name != 'setint':
+        letters += '-' + ordering_name
+    name = '{0}-{1}-{2}-{3}.v{4}.bin'.format(kind, mod, letters, default_m,
+                                            VERSION)
+    return os.path.join(cache_dir(), name)
+
+
+def _canon_bits(canon):
+    return sum([1 << index for index, value in enumerate(canon) if value])
+
+
+def _map(path, magic, key, typecodes):
+    """
+    Returns a list of memoryviews of the arrays with the given typecodes in a
+    table file, each with 2 ** mod items, or None if there is no valid file.
+    """
+    mod, canon, default_m = key
+    size = 2 ** mod
+    try:
+        with open(path, 'rb') as table_file:
+            data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, OSError, ValueError):
+        return None
+    header = (magic, VERSION, mod, _canon_bits(canon), default_m, BYTEORDER)
+    itemsizes = [array(typecode).itemsize for typecode in typecodes]
+    if len(data) != HEADER.size + size * sum(itemsizes) or \
+            HEADER.unpack_from(data) != header:
+        data.close()
+        return None
+    view = memoryview(data)
+    start = HEADER.size
+    result = []
+    for typecode, itemsize in zip(typecodes, itemsizes):
+        result.append(view[start:start + size * itemsize].cast(typecode))
+        start += size * itemsize
+    return result
+
+
+def load(mod=12, canon=(True, True, False), default_m=5, ordering=None):
+    """
+    Returns the table for a modulus, canonical operators (T, I, M), default m
+    and ordering (by default the current one) from its file as a tuple of
+    memoryviews (primes, ns, ms), or None if there is no valid file. The
+    memoryviews support the buffer protocol, so numpy.frombuffer can also
+    read them without a copy.
+    """
+    key = _key(mod, canon, default_m)
+    result = _map(filename(*key, ordering=ordering), MAGIC, key, 'IhB')
+    if result is None:
+        return None
+    primes, ms, ns = result
+    return (primes, ns, ms)
+
+
+def _build(mod, canon, default_m, ordering=None):
+    """
+    Builds the table for a modulus, canonical operators (T, I, M), default m
+    and ordering (by default the current one) in memory as a tuple of arrays
+    (primes, ns, ms).
+    """
+    operations = utils.canonical_operations(mod, canon, default_m)
+    key = _ordering_key(canon, ordering)
+    if not (canon[0] and utils.is_group(mod, operations)):
+        size = 2 ** mod
+        primes = array('I', [0]) * size
+        ns = array('B', [0]) * size
+        ms = array('h', [0]) * size
+        for integer in range(0, size):
+            primes[integer], (ns[integer], ms[integer]) = \
+                utils.prime_form(integer, mod, canon, default_m, key)
+        return (primes, ns, ms)
+    # The canonical operations are closed, so every set in an orbit has the
+    # same prime form and each orbit only needs to be found once.
+    return orbit_table(mod, operations, key=key)
+
+
+def orbit_table(mod, multipliers, transpose=True, key=None):
+    """
+    Builds a table (primes, ns, ms) as for prime_table() for a group of TnMm
+    operations in a modulus, given as a list of multipliers, which must be
+    closed under multiplication and all be units of the modulus, and whether
+    Tn is included. The prime form is the lowest integer of an orbit, or the
+    lowest key(integer, mod) if a key function is given. Ties between
+    operations reaching the prime form go to the lowest n and then to the
+    first of the multipliers.
+    """
+    size = 2 ** mod
+    primes = array('I', [0]) * size
+    ns = array('B', [0]) * size
+    ms = array('h', [0]) * size
+    each_n = range(0, mod) if transpose else (0,)
+    done = bytearray(size)
+    for integer in range(0, size):
+        if done[integer]:
+            continue
+        orbit = set()
+        for m in multipliers:
+            multiplied = utils.multiply_int(integer, m, mod)
+            for n in each_n:
+                orbit.add(utils.rotate(multiplied, n, mod))
+        if key is None:
+            prime = min(orbit)
+        else:
+            prime = min(orbit, key=lambda each: (key(each, mod), each))
+        # Map each Tn of the prime to the lowest n that undoes it
+        offsets = {}
+        for n in reversed(each_n):
+            offsets[utils.rotate(prime, -n, mod)] = n
+        for each in orbit:
+            best = None
+            for m in multipliers:
+                n = offsets.get(utils.multiply_int(each, m, mod))
+                if n is not None and (best is None or n < best[0]):
+                    best = (n, m)
+            primes[each] = prime
+            ns[each], ms[each] = best
+            done[each] = 1
+    return (primes, ns, ms)
+
+
+def _table(mod, canon, default_m, ordering=None):
+    """
+    Returns the table from memory or its file, building it in memory if the
+    modulus is no greater than MAX_MOD. Returns None otherwise.
+    """
+    key = _cache_key(mod, canon, default_m, ordering)
+    try:
+        return _tables[key]
+    except KeyError:
+        pass
+    table = load(*key)
+    if table is None and mod <= MAX_MOD:
+        table = _build(*key)
+    _tables[key] = table
+    return table
+
+
+def prime_table(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns a tuple of three sequences (primes, ns, ms), indexed by integer
+    representation, for the given modulus, canonical operators (T, I, M) and
+    default m. The table is read from its file or built on first use. Returns
+    None if the modulus is greater than MAX_MOD and there is no table file,
+    since building the table would take 2 ** mod prime forms (use save() to
+    build its file, or prime_form() for one set).
+    """
+    return _table(mod, canon, default_m)
+
+
+def prime_form(integer, mod=12, canon=(True, True, False), default_m=5,
+               ordering=None):
+    """
+    Same as utils.prime_form, but looks the result up in the table for the
+    modulus when there is one. The prime form is chosen by an ordering in
+    ORDERINGS, by default the current one.
+    """
+    table = _table(mod, canon, default_m, ordering)
+    if table is not None:
+        primes, ns, ms = table
+        return primes[integer], (ns[integer], ms[integer])
+    key = _cache_key(mod, canon, default_m, ordering) + (integer,)
+    result = _results.get(key)
+    if result is None:
+        result = utils.prime_form(integer, mod, canon, default_m,
+                                  _ordering_key(key[1], key[3]))
+        _results.set(key, result)
+    return result
+
+
+def prime_ints(mod=12, canon=(True, True, False), default_m=5, card=None):
+    """
+    Returns a tuple of the integer representation of each prime form in a
+    modulus, in ascending order, for the given canonical operators (T, I, M)
+    and default m, optionally only those with a given cardinality.
+    """
+    key = _cache_key(mod, canon, default_m) + (('primes', card),)
+    result = _mod_results.get(key)
+    if result is None:
+        result = utils.primes(mod, card, canon, default_m)
+        if _ordering_key(key[1]) is not None:
+            # Each of the lowest integers is in a different set-class
+            result = sorted([prime_form(integer, mod, canon, default_m)[0] \
+                             for integer in result])
+        result = tuple(result)
+        _mod_results[key] = result
+    return result
+
+
+def _build_ordinals(mod, canon, default_m):
+    """
+    Builds the ordinal table for a modulus, canonical operators (T, I, M) and
+    default m in memory as an array indexed by integer representation.
+    """
+    table = _table(mod, canon, default_m)
+    if table is None:
+        table = _build(*_cache_key(mod, canon, default_m))
+    primes = table[0]
+    size = 2 ** mod
+    ordinals = array('I', [0]) * size
+    counts = [0] * (mod + 1)
+    # Primes are found in prime order, but with orderings other than setint
+    # they may come after other sets of their class.
+    for integer in range(0, size):
+        if primes[integer] == integer:
+            card = utils.popcount(integer)
+            counts[card] += 1
+            ordinals[integer] = counts[card]
+    for integer in range(0, size):
+        ordinals[integer] = ordinals[primes[integer]]
+    return ordinals
+
+
+def load_ordinals(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns the ordinal table for a modulus, canonical operators (T, I, M)
+    and default m from its file as a memoryview, or None if there is no
+    valid file.
+    """
+    key = _key(mod, canon, default_m)
+    result = _map(filename(*key, kind='ordinals'), ORDINALS_MAGIC, key, 'I')
+    return None if result is None else result[0]
+
+
+def _ordinal_table(mod, canon, default_m):
+    """
+    Returns the ordinal table from memory or its file, building it in memory
+    if the modulus is no greater than MAX_MOD. Returns None otherwise.
+    """
+    key = _cache_key(mod, canon, default_m)
+    try:
+        return _ordinal_tables[key]
+    except KeyError:
+        pass
+    table = load_ordinals(*key[:3])
+    if table is None and mod <= MAX_MOD:
+        table = _build_ordinals(*key[:3])
+    _ordinal_tables[key] = table
+    return table
+
+
+def ordinal(integer, mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns the position (from 1) of the set-class of an integer
+    representation among the prime forms with the same cardinality, in
+    prime order, for the given modulus, canonical operators (T, I, M) and
+    default m. Without a table this searches the cached prime_ints() of the
+    cardinality.
+    """
+    table = _ordinal_table(mod, canon, default_m)
+    if table is not None:
+        return table[integer]
+    prime = prime_form(integer, mod, canon, default_m)[0]
+    each_prime = prime_ints(mod, canon, default_m, utils.popcount(prime))
+    return bisect_left(each_prime, prime) + 1
+
+
+def forte_name(integer, mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns the generated Forte-style name 'card-index' of the set-class of
+    an integer representation, where index is the set-class's ordinal().
+    Unlike the names in sator.const these are given in prime order, and
+    exist for every modulus.
+    """
+    card = utils.popcount(integer)
+    return '{0}-{1}'.format(card, ordinal(integer, mod, canon, default_m))
+
+
+def from_forte_name(name, mod=12, canon=(True, True, False), default_m=5):
+    """
+    Returns the integer representation of the prime form with a generated
+    name as given by forte_name(), or None if there is no such set-class.
+    """
+    try:
+        card, index = [int(part) for part in name.split('-')]
+    except (AttributeError, ValueError):
+        return None
+    if not 0 <= card <= mod or index < 1:
+        return None
+    each_prime = prime_ints(mod, canon, default_m, card)
+    if index > len(each_prime):
+        return None
+    return each_prime[index - 1]
+
+
+def index_icvs(integers, mod=12):
+    """
+    Returns a dict mapping each interval class vector (as a tuple) of a list
+    of integer representations to a tuple of the integers with that ICV, in
+    the order given.
+    """
+    index = {}
+    for integer in integers:
+        icv = tuple(utils.icv_int(integer, mod))
+        index[icv] = index.get(icv, ()) + (integer,)
+    return index
+
+
+def icv_index(mod=12, canon=(True, True, False), default_m=5, card=None):
+    """
+    Returns a dict mapping each interval class vector (as a tuple) of the
+    prime forms in a modulus to a tuple of those prime forms, in prime
+    order, for the given canonical operators (T, I, M) and default m,
+    optionally only for those with a given cardinality. Prime forms which
+    share an ICV are Z-related.
+    """
+    key = _cache_key(mod, canon, default_m) + (('icvs', card),)
+    result = _mod_results.get(key)
+    if result is None:
+        result = index_icvs(prime_ints(mod, canon, default_m, card), mod)
+        _mod_results[key] = result
+    return result
+
+
+def cache_size(size=None):
+    """
+    Takes one argument as the maximum number of per-set results kept by the
+    result cache. Without an argument, returns the current maximum.
+    """
+    return _results.maxsize(size)
+
+
+def cache_info():
+    """
+    Returns a dict of the hits, misses, current size and maximum size of the
+    result cache.
+    """
+    return _results.info()
+
+
+def save(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Builds the table for a modulus, canonical operators (T, I, M) and
+    default m and writes it to its file in the cache directory. Returns the
+    path of the file.
+    """
+    key = _key(mod, canon, default_m)
+    cache_key = _cache_key(*key)
+    primes, ns, ms = _tables.get(cache_key) or _build(*key)
+    path = _write(filename(*key), MAGIC, key, (primes, ms, ns))
+    _tables.pop(cache_key, None)
+    return path
+
+
+def _write(path, magic, key, arrays):
+    """Writes a header and arrays to a table file. Returns its path."""
+    mod, canon, default_m = key
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    # Write to a temporary file first so that readers never see part of one
+    temp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as table_file:
+        table_file.write(HEADER.pack(magic, VERSION, mod, _canon_bits(canon),
+                                     default_m, BYTEORDER))
+        for values in arrays:
+            table_file.write(values.tobytes())
+    getattr(os, 'replace', os.rename)(temp_path, path)
+    return path
+
+
+def save_ordinals(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Builds the ordinal table for a modulus, canonical operators (T, I, M)
+    and default m and writes it to its file in the cache directory. Returns
+    the path of the file.
+    """
+    key = _key(mod, canon, default_m)
+    cache_key = _cache_key(*key)
+    ordinals = _ordinal_tables.get(cache_key) or _build_ordinals(*key)
+    path = _write(filename(*key, kind='ordinals'), ORDINALS_MAGIC, key,
+                  (ordinals,))
+    _ordinal_tables.pop(cache_key, None)
+    return path
+
+
+def build(mods, canon=(True, True, False), default_m=5):
+    """
+    Writes the prime and ordinal table files for each modulus in mods.
+    Returns the paths of the prime table files.
+    """
+    paths = []
+    for mod in mods:
+        paths.append(save(mod, canon, default_m))
+        save_ordinals(mod, canon, default_m)
+    return paths
+
+
+def clear():
+    """
+    Drop every table that has been loaded or built and every cached result.
+    """
+    _tables.clear()
+    _ordinal_tables.clear()
+    _results.clear()
+    _mod_results.clear()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    first = int(args[0]) if args else 12
+    last = int(args[1]) if len(args) > 1 else first
+    letters = args[2].upper() if len(args) > 2 else 'TI'
+    canon = tuple([letter in letters for letter in 'TIM'])
+    for mod in range(first, last + 1):
+        print(save(mod, canon))
+        print(save_ordinals(mod, canon))
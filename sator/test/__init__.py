@@ -5,4 +5,12 @@ __all__ = [
     'tonerow',
     'sim_mzc',
     'neo_r',
+    'storage',
+    'frozen',
+    'pool',
+    'tables',
+    'groups',
+    'catalog',
+    'database',
+    'sample',
 ]
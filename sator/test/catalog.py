@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+from unittest import TestCase, main
+
+from sator import catalog, pool
+from sator.catalog import SetClassCatalog
+import sator.utils as utils
+from sator.core import PCSet, FrozenPCSet
+
+
+class SetClassCatalogTest(TestCase):
+    """Catalogs of the set-classes of a modulus"""
+
+    def setUp(self):
+        self.catalog = catalog.get(12)
+
+    def testGet(self):
+        self.assertTrue(catalog.get(12) is self.catalog)
+        self.assertTrue(catalog.get(12, (1, 1, 0)) is self.catalog)
+        self.assertFalse(catalog.get(12, (True, False, False)) is self.catalog)
+        self.assertEqual(len(self.catalog), 224)
+        self.assertTrue(utils.setint([0, 1, 4, 6]) in self.catalog)
+        self.assertFalse(utils.setint([1, 2]) in self.catalog)
+
+    def testColumns(self):
+        for canon in ((True, True, False), (True, False, False),
+                      (True, True, True)):
+            classes = catalog.get(12, canon)
+            for each in PCSet.each_prime_in_mod(12, canon):
+                row = classes.row(each)
+                self.assertEqual(row['prime'], each.setint)
+                self.assertEqual(row['card'], each.cardinality)
+                self.assertEqual(row['icv'], tuple(each.icv))
+                self.assertEqual(row['name'], each.forte)
+                self.assertEqual(row['ds'], each.ds)
+                self.assertEqual(list(row['invariance_vector']),
+                                 each.invariance_vector)
+                self.assertEqual(row['complement'],
+                                 each.abstract_compliment.setint)
+                self.assertEqual(row['mpartner'], each.mpartner.setint)
+
+    def testOtherModulus(self):
+        classes = catalog.get(13)
+        a = PCSet(0, 1, 4, 6, mod=13)
+        self.assertEqual(classes.row(a)['name'], a.forte)
+        self.assertEqual([each for each in classes.each_set(icv=a.icv)],
+                         [a.prime] + a.zpartners)
+
+    def testQueries(self):
+        each_prime = list(PCSet.each_prime_in_mod(12))
+        self.assertEqual(list(self.catalog.each_int()),
+                         [each.setint for each in each_prime])
+        self.assertEqual(list(self.catalog.each_int(card=7, ds=2)),
+            [each.setint for each in each_prime \
+             if each.cardinality == 7 and each.ds == 2])
+        self.assertEqual(list(self.catalog.each_set(icv=[4, 1, 1, 1, 1, 1, 1])),
+                         [[0, 1, 4, 6], [0, 1, 3, 7]])
+        self.assertEqual(list(self.catalog.each_set(name='3-11')),
+                         [[0, 3, 7]])
+        self.assertEqual(list(self.catalog.each_set(complement=[0, 1, 2])),
+                         [[0, 1, 2, 3, 4, 5, 6, 7, 8]])
+        self.assertEqual(list(self.catalog.each_set(
+            mpartner=PCSet(0, 1, 2))), [[0, 2, 7]])
+        self.assertEqual(self.catalog.count(card=6), 50)
+        self.assertEqual(self.catalog.count(card=6, ds=2),
+                         len(list(self.catalog.each_int(card=6, ds=2))))
+        vector = PCSet(0, 4, 8).invariance_vector
+        self.assertEqual(list(self.catalog.each_set(invariance_vector=vector)),
+                         [[0, 4, 8]])
+        self.assertEqual(list(self.catalog.each_int(card=13)), [])
+        self.assertEqual(list(self.catalog.each_int(card=None)),
+                         list(self.catalog.each_int()))
+        self.assertRaises(SetClassCatalog.InvalidQuery, self.catalog.each_int,
+                          cardinality=3)
+
+    def testEachSet(self):
+        each = next(self.catalog.each_set(card=3))
+        self.assertTrue(isinstance(each, PCSet))
+        self.assertEqual(each.get_canon, (True, True, False))
+        pool.enable()
+        try:
+            each = next(self.catalog.each_set(card=3))
+            self.assertTrue(isinstance(each, FrozenPCSet))
+        finally:
+            pool.disable()
+
+
+if __name__ == '__main__':
+    main()
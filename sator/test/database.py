@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase, main
+
+from sator import database
+import sator.utils as utils
+from sator.core import PCSet
+
+
+class DatabaseTest(TestCase):
+    """Set-class catalogs exported to SQLite"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'classes.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testExport(self):
+        self.assertEqual(database.export(self.path, [7, 12]), 18 + 224)
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute(
+                'SELECT setint, prime, card, icv, name, ds, '
+                'invariance_vector, complement, mpartner, ic3 FROM '
+                'set_classes WHERE mod = 12 AND canon = ? ORDER BY prime',
+                ('TI',)).fetchall()
+        finally:
+            connection.close()
+        self.assertEqual(len(rows), 224)
+        for row, each in zip(rows, PCSet.each_prime_in_mod(12)):
+            self.assertEqual(row[0], each.setint)
+            self.assertEqual(row[1], each.setint)
+            self.assertEqual(row[2], each.cardinality)
+            self.assertEqual(json.loads(row[3]), each.icv)
+            self.assertEqual(row[4], each.forte)
+            self.assertEqual(row[5], each.ds)
+            self.assertEqual([tuple(pair) for pair in json.loads(row[6])],
+                             each.invariance_vector)
+            self.assertEqual(row[7], each.abstract_compliment.setint)
+            self.assertEqual(row[8], each.mpartner.setint)
+            self.assertEqual(row[9], each.icv[3])
+        # Exporting again replaces the rows of a catalog
+        self.assertEqual(database.export(self.path, [7]), 18)
+        self.assertEqual(len(database.query(self.path, mod=7)), 18)
+
+    def testQuery(self):
+        database.export(self.path, [12])
+        expected = [each for each in PCSet.each_prime_in_card_mod(6, 12) \
+                    if each.ds >= 2 and each.icv[6] == 1]
+        self.assertEqual(list(PCSet.each_prime_in_database(
+            self.path, 'card = ? AND ds >= 2 AND ic6 = 1', (6,))), expected)
+        self.assertEqual(database.query(self.path, 'name = ?', ('4-Z15',)),
+                         [utils.setint([0, 1, 4, 6])])
+        self.assertEqual(database.query(self.path, mod=13), [])
+        self.assertEqual(database.query(self.path,
+                                        canon=(True, False, False)), [])
+
+    def testEverySet(self):
+        database.export(self.path, [5, 6], (True, False, False),
+                        every_set=True)
+        a = PCSet(3, 4, 8, mod=6)
+        a.canon(True, False, False)
+        self.assertEqual(database.query(self.path, 'setint = ?', (a.setint,),
+                                        6, (True, False, False)),
+                         [a.pcint])
+        self.assertEqual(len(database.query(self.path, mod=6,
+                                            canon=(True, False, False))),
+                         sum(PCSet.prime_counts_in_mod(6,
+                                                       (True, False, False))))
+        each = next(PCSet.each_prime_in_database(
+            self.path, 'card = 2', mod=5, canon=(True, False, False)))
+        self.assertEqual(each.get_canon, (True, False, False))
+        self.assertEqual(each.mod(), 5)
+
+
+if __name__ == '__main__':
+    main()
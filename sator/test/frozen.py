@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+from unittest import TestCase, main
+
+from sator.core import PCSet, PSet, ToneRow
+from sator.core import FrozenPCSet, FrozenPSet, FrozenToneRow
+
+
+class FrozenSetTest(TestCase):
+    """Frozen sets are hashable, immutable and share the analysis API"""
+
+    def setUp(self):
+        self.l = [0, 1, 4, 6]
+        self.pcset = PCSet(self.l)
+        self.frozen = FrozenPCSet(self.l)
+
+    def testEquality(self):
+        self.assertEqual(self.frozen, self.pcset)
+        self.assertEqual(self.frozen, FrozenPSet(self.l))
+
+    def testHash(self):
+        d = {self.frozen: 1}
+        self.assertEqual(d[FrozenPCSet(6, 4, 1, 0)], 1)
+        self.assertEqual(d[FrozenPSet(self.l)], 1)
+        self.assertEqual(len(set([self.frozen, self.pcset.freeze()])), 1)
+        self.assertRaises(TypeError, hash, self.pcset)
+
+    def testMutators(self):
+        a = self.frozen
+        for method in (a.t, a.i, a.m, a.mi, a.insert, a.clear, a.c, a.z):
+            self.assertRaises(a.ImmutableObject, method, 0, 1)
+        self.assertRaises(a.ImmutableObject, a.__setitem__, 0, 1)
+        self.assertRaises(a.ImmutableObject, a.mod, 7)
+        self.assertRaises(a.ImmutableObject, a.canon, True, False, False)
+        self.assertEqual(a.mod(), 12)
+        self.assertEqual(a, self.l)
+
+    def testCachedValues(self):
+        a = self.frozen
+        self.assertEqual(a.prime, self.pcset.prime)
+        self.assertTrue(a.prime is a.prime)
+        self.assertTrue(isinstance(a.prime, FrozenPCSet))
+        self.assertEqual(a.icv, self.pcset.icv)
+        self.assertEqual(a.forte, '4-Z15')
+        self.assertEqual(a.zpartner, self.pcset.zpartner)
+        a.icv.append(0)
+        a.pitches.append(3)
+        self.assertEqual(a.icv, self.pcset.icv)
+        self.assertEqual(a, self.l)
+
+    def testOperationsReturnFrozen(self):
+        for each in (self.frozen.copy(), self.frozen._transpose(1),
+                     self.frozen + 2, self.frozen.union([3])):
+            self.assertTrue(isinstance(each, FrozenPCSet))
+
+    def testFreezeThaw(self):
+        a = PCSet(self.l, mod=7)
+        a.canon(True, False, True)
+        a.default_m(3)
+        b = a.freeze()
+        self.assertEqual(b.get_canon, (True, False, True))
+        self.assertEqual((b.mod(), b.default_m()), (7, 3))
+        self.assertEqual(b.prime, a.prime)
+        c = b.thaw()
+        self.assertTrue(isinstance(c, PCSet) and not isinstance(c, FrozenPCSet))
+        self.assertEqual(c.get_canon, (True, False, True))
+        c.t(1)
+
+    def testPSet(self):
+        a = FrozenPSet(0, 4, 7, ordered=True)
+        self.assertEqual(a.P(), [0, 3, 7])
+        self.assertEqual(a.root, [0])
+        self.assertEqual(a.paths(PSet(0, 3, 7)), ['P'])
+        self.assertEqual(PSet(0, 4, 7).paths(FrozenPSet(0, 3, 7)), ['P'])
+        b = PSet(0, 3, 7, 7, multiset=True)
+        self.assertEqual(PSet(0, 4, 7).paths(b[:]), ['P'])
+        self.assertEqual(b.pitches, [0, 3, 7, 7])
+
+
+class FrozenToneRowTest(TestCase):
+
+    def setUp(self):
+        self.l = [0, 4, 5, 8, 9, 1, 10, 3, 6, 2, 7, 11]
+        self.row = FrozenToneRow(self.l)
+
+    def testRowForms(self):
+        row = ToneRow(self.l)
+        for form in ('P', 'R', 'I', 'RI', 'M', 'MI', 'RM', 'RMI'):
+            self.assertEqual(getattr(self.row, form), getattr(row, form))
+            self.assertTrue(isinstance(getattr(self.row, form), FrozenToneRow))
+
+    def testMutators(self):
+        self.assertRaises(self.row.ImmutableObject, self.row.swap, 0, 1)
+        self.assertRaises(self.row.ImmutableObject, self.row.t, 1)
+        self.assertEqual(hash(self.row), hash(ToneRow(self.l).freeze()))
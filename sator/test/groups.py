@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+import pickle
+from unittest import TestCase, main
+
+from sator import groups
+from sator.groups import AffineGroup
+import sator.utils as utils
+from sator.core import PCSet, PSet
+
+
+class AffineGroupTest(TestCase):
+    """Groups of TnMm operations"""
+
+    def testUnits(self):
+        self.assertEqual(groups.units(12), [1, 5, 7, 11])
+        self.assertEqual(groups.units(7), [1, 2, 3, 4, 5, 6])
+
+    def testClosure(self):
+        group = AffineGroup(7, [3])
+        self.assertEqual(group.multipliers, (1, 2, 3, 4, 5, 6))
+        self.assertEqual(len(group), 42)
+        self.assertEqual(AffineGroup(12, [-1]).multipliers, (1, 11))
+        self.assertEqual(len(AffineGroup(12, [5], False)), 2)
+
+    def testInvalid(self):
+        self.assertRaises(AffineGroup.InvalidGroup, AffineGroup, 10, [5])
+        self.assertRaises(AffineGroup.InvalidGroup, groups.get, 24, [2])
+
+    def testGet(self):
+        self.assertTrue(groups.get(12, [1, 11]) is groups.get(12, [-1]))
+        self.assertEqual(groups.get(12, [11]), AffineGroup(12, [1, 11]))
+        self.assertNotEqual(groups.get(12, [11]), groups.get(12, [11], False))
+
+    def testMatchesCanon(self):
+        # T/I and T/I/M groups agree with the canon settings in mod 12
+        for multipliers, canon in (([1], (True, False, False)),
+                                   ([11], (True, True, False)),
+                                   ([5, 11], (True, True, True))):
+            group = groups.get(12, multipliers)
+            for integer in range(0, 4096, 5):
+                self.assertEqual(group.prime_form(integer)[0],
+                                 utils.prime_form(integer, 12, canon)[0])
+
+    def testPrimeForm(self):
+        for mod in (7, 10, 13):
+            for transpose in (True, False):
+                group = groups.get(mod, groups.units(mod), transpose)
+                group._table = None
+                for integer in range(0, 2 ** mod, 37):
+                    prime, (n, m) = group.prime_form(integer)
+                    self.assertEqual(prime, min(group.orbit(integer)))
+                    self.assertEqual(group.act(integer, n, m), prime)
+                    self.assertEqual((prime, (n, m)),
+                        tables_prime_form(group, integer))
+
+    def testOrbitSize(self):
+        group = groups.get(12, [11])
+        self.assertEqual(group.orbit_size(utils.setint([0, 4, 8])), 4)
+        self.assertEqual(group.orbit_size(utils.setint([0, 1, 3])), 24)
+        self.assertEqual(group.stabilizer(utils.setint([0, 6])),
+                         [(0, 1), (6, 1), (0, 11), (6, 11)])
+
+
+def tables_prime_form(group, integer):
+    primes, ns, ms = group.table
+    return primes[integer], (ns[integer], ms[integer])
+
+
+class CanonGroupTest(TestCase):
+    """Sets with a canonical group in place of the canon settings"""
+
+    def setUp(self):
+        self.a = PCSet(0, 1, 3, mod=7)
+
+    def testCanonGroup(self):
+        self.assertEqual(self.a.canon_group(), None)
+        self.a.canon_group(groups.units(7))
+        self.assertEqual(self.a.canon_group(), AffineGroup(7, [3]))
+        self.a.canon(True, True, False)
+        self.assertEqual(self.a.canon_group(), None)
+        self.assertRaises(AffineGroup.InvalidGroup, PCSet(0, 1).canon_group,
+                          [2])
+
+    def testPrime(self):
+        # 01 and 03 are related by M3 in mod 7, but not by Tn/TnI
+        a = PCSet(0, 1, mod=7)
+        b = PCSet(0, 3, mod=7)
+        self.assertNotEqual(a.prime, b.prime)
+        for each in (a, b):
+            each.canon_group(groups.units(7))
+        self.assertEqual(a.prime, b.prime)
+        self.assertEqual(a.prime.mod(), 7)
+        self.assertEqual(a.pcint, a.prime.setint)
+        n, m = b.prime_operation
+        self.assertEqual(b._transpose_multiply(n, m), b.prime)
+
+    def testInvarianceAndOrbits(self):
+        c = PCSet(0, 1, 3, mod=7)
+        c.canon_group([2])
+        self.assertEqual(c.invariance_vector, [(0, 1), (1, 2), (3, 4)])
+        self.assertEqual(c.orbit_size, 7)
+        self.assertEqual(PCSet(0, 4, 8).orbit_size, 4)
+        self.assertEqual(PCSet(0, 1, 3).orbit_size, 24)
+        d = PCSet(0, 1, 3)
+        d.canon(True, False, False)
+        self.assertEqual(d.orbit_size, 12)
+
+    def testCopies(self):
+        self.a.canon_group([3], False)
+        for each in (self.a.copy(), self.a.copy([0, 2]),
+                     pickle.loads(pickle.dumps(self.a)), self.a.freeze(),
+                     self.a.freeze().thaw(), self.a._transpose(1)):
+            self.assertEqual(each.canon_group(), self.a.canon_group())
+        frozen = self.a.freeze()
+        self.assertRaises(frozen.ImmutableObject, frozen.canon_group, [1])
+
+    def testEachPrime(self):
+        for transpose in (True, False):
+            group = groups.get(7, [3], transpose)
+            primes = [integer for integer in range(0, 2 ** 7) \
+                      if group.prime_form(integer)[0] == integer]
+            self.assertEqual(list(group.primes()), primes)
+            self.assertEqual(list(group.primes(2)),
+                [integer for integer in primes if utils.popcount(integer) == 2])
+        self.a.canon_group([3])
+        each_prime = list(self.a.each_prime())
+        self.assertEqual([each.setint for each in each_prime],
+                         list(groups.get(7, [3]).primes()))
+        self.assertEqual(each_prime[3].canon_group(), groups.get(7, [3]))
+
+    def testCounts(self):
+        for mod in range(1, 12):
+            for multipliers, transpose in (([1], True), ([-1], True),
+                                           ([-1], False), ([2, -1], True)):
+                if utils.gcd(2, mod) != 1:
+                    continue
+                group = groups.get(mod, multipliers, transpose)
+                counts = [0] * (mod + 1)
+                for integer in group.primes():
+                    counts[utils.popcount(integer)] += 1
+                self.assertEqual(group.counts(), counts)
+
+    def testPrimeCounts(self):
+        self.assertEqual(PCSet.prime_counts_in_mod(12),
+                         [1, 1, 6, 12, 29, 38, 50, 38, 29, 12, 6, 1, 1])
+        self.assertEqual(sum(PCSet.prime_counts_in_mod(12,
+                                                       (True, True, True))),
+                         158)
+        self.assertEqual(PCSet.count_primes_in_card_mod(4, 12), 29)
+        for canon in ((True, False, False), (True, True, False),
+                      (False, True, False)):
+            self.assertEqual(PCSet.count_primes_in_card_mod(3, 10, canon),
+                len(list(PCSet.each_prime_in_card_mod(3, 10, canon))))
+        self.assertEqual(sum(PCSet.prime_counts_in_mod(24)), 352698)
+        self.assertEqual(self.a.prime_counts(),
+                         PCSet.prime_counts_in_mod(7))
+        self.a.canon_group([3])
+        self.assertEqual(sum(self.a.prime_counts()),
+                         len(list(self.a.each_prime())))
+        # 5 is not a unit of mod 10, so the prime forms are enumerated
+        canon = (True, True, True)
+        self.assertEqual(PCSet.prime_counts_in_mod(10, canon),
+                         [len(list(PCSet.each_prime_in_card_mod(card, 10,
+                                                                canon))) \
+                          for card in range(0, 11)])
+        self.assertEqual(PCSet.count_primes_in_card_mod(4, 10, canon),
+                         len(list(PCSet.each_prime_in_card_mod(4, 10, canon))))
+
+    def testPrimeCountsNotGroup(self):
+        # T/I/M in mod 7 and mod 9 with m = 2 are not closed, so the counts
+        # are those of the prime forms rather than of the generated group
+        for mod, default_m in ((7, 5), (9, 2)):
+            canon = (True, True, True)
+            self.assertEqual(
+                PCSet.prime_counts_in_mod(mod, canon, default_m),
+                [len(list(PCSet.each_prime_in_card_mod(card, mod, canon,
+                                                       default_m))) \
+                 for card in range(0, mod + 1)])
+        self.assertEqual(PCSet.prime_counts_in_mod(7, (True, True, True)),
+                         [1, 1, 2, 2, 2, 2, 1, 1])
+        self.assertEqual(PCSet.count_primes_in_card_mod(2, 7,
+                                                        (True, True, True)),
+                         2)
+        self.assertEqual(groups.count_primes(7, (True, True, True)), 12)
+
+    def testInvarianceVectorPSet(self):
+        # Pitch sets compare their pitches, so are not invariant under T0
+        self.assertEqual(PSet(0, 16).invariance_vector, [])
+        self.assertEqual(PCSet(0, 16).invariance_vector,
+                         PCSet(0, 4).invariance_vector)
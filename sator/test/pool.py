@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+import gc
+from unittest import TestCase, main
+
+from sator import pool
+from sator.core import PCSet, PSet, FrozenPCSet
+
+
+class PoolTest(TestCase):
+    """The pool returns one shared FrozenPCSet per set when enabled"""
+
+    def setUp(self):
+        pool.enable()
+
+    def tearDown(self):
+        pool.disable()
+
+    def testGet(self):
+        a = pool.get(145)
+        self.assertTrue(a is pool.get(145))
+        self.assertTrue(isinstance(a, FrozenPCSet))
+        self.assertEqual(a, [0, 4, 7])
+        self.assertFalse(a is pool.get(145, 11))
+        self.assertFalse(a is pool.get(145, canon=(True, False, False)))
+        self.assertEqual(pool.get(145, canon=(1, 0, 0)).get_canon,
+                         (True, False, False))
+        self.assertFalse(a is pool.get(145, default_m=7))
+
+    def testFromInt(self):
+        self.assertTrue(PCSet.fromint(145) is PCSet.fromint(145))
+        self.assertFalse(PCSet.fromint(145) is PCSet.fromint(145, 13))
+
+    def testGenerators(self):
+        sets = list(PCSet.each_set_in_mod(6))
+        self.assertTrue(sets[5] is PCSet.fromint(5, 6))
+        cards = list(PCSet.each_card_in_mod(2, 6))
+        self.assertTrue(cards[0] is sets[3])
+        self.assertFalse(isinstance(next(PSet.each_card_in_mod(2, 6)),
+                                    FrozenPCSet))
+
+    def testResults(self):
+        a = PCSet(0, 1, 3, 7)
+        pool.disable()
+        m_vector = a.m_vector(3)
+        subprimes = list(a.subprimes())
+        pool.enable()
+        self.assertEqual(a.m_vector(3), m_vector)
+        self.assertEqual(list(a.subprimes()), subprimes)
+
+    def testEviction(self):
+        pool.clear()
+        a = pool.get(7)
+        self.assertEqual(pool.size(), 1)
+        del a
+        gc.collect()
+        self.assertEqual(pool.size(), 0)
+
+    def testDisabled(self):
+        pool.disable()
+        self.assertFalse(PCSet.fromint(5) is PCSet.fromint(5))
+        self.assertFalse(isinstance(PCSet.fromint(5), FrozenPCSet))
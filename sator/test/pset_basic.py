@@ -1,8 +1,10 @@
 #!/usr/bin/env python
+import copy
+import pickle
 from unittest import TestCase, main
 
 from sator.setbase import SetBase
-from sator.core import PCSet, PSet
+from sator.core import PCSet, PSet, ToneRow
 
 
 """Test PCSet/PSet class overrides"""
@@ -51,6 +53,13 @@ class InitTests(TestCase):
         self.assertEqual(d._unique_pcs, [0, 1, 2])
         self.assertEqual(e._unique_pcs, [0, 1, 2, 3, 9])
 
+    def testInitDupes(self):
+        a = PSet([5, 3, 5, 245, -3, 3], [125, 1])
+        b = PSet([5, 3, 5, 245], multiset=True)
+        self.assertEqual(a.pitches, [5, 3, -3, 1])
+        self.assertEqual(b.pitches, [5, 3, 5, 5])
+        self.assertEqual(a._rm_dupes([4, 1, 4, 0, 1, 2]), [4, 1, 0, 2])
+
     def testInitPSet(self):
         a = PSet([0, 15, 6])
         b = PCSet([0, 1, 9])
@@ -156,6 +165,29 @@ class EqualityTest(TestCase):
         b = PSet(3)
         self.assertTrue(a == 3 and b == 3)
 
+    def testeqSettings(self):
+        a = PSet(0, 4, 16)
+        b = PSet(0, 4, 16)
+        self.assertTrue(a == b)
+        b.ordered(True)
+        self.assertTrue(a == b)
+        self.assertTrue(a == PSet(16, 4, 0))
+        c = PSet(16, 4, 0)
+        c.ordered(True)
+        self.assertFalse(b == c)
+        self.assertFalse(a == PCSet(0, 4, 16))
+        b.multiset(True)
+        b.insert(0, 0)
+        self.assertFalse(a == b)
+
+    def testeqKeyCached(self):
+        a = PCSet(self.l)
+        key = a._key
+        self.assertTrue(a == self.pcset)
+        self.assertTrue(a._key is key)
+        a.insert(0, 11)
+        self.assertFalse(a == self.pcset)
+
 
 class InEqualityTest(TestCase):
     """Check for != between PCSets, PSets, and built ins"""
@@ -211,6 +243,37 @@ class GetItemTest(TestCase):
     def testgetAfter(self):
         self.assertRaises(IndexError, self.pcset.__getitem__, 100)
 
+    def testgetView(self):
+        a = self.pset[2:5]
+        self.assertEqual(a.storage(), 'view')
+        self.assertTrue(isinstance(a, PSet))
+        self.assertRaises(a.ImmutableObject, a.t, 1)
+        self.pset.t(1)
+        self.assertEqual(a, [2, 4, 5])
+        self.assertEqual(a.pitches, [2, 4, 5])
+        b = a.thaw()
+        b.t(1)
+        self.assertEqual(b, [3, 5, 6])
+        self.assertEqual(a + [0], [0, 2, 4, 5])
+
+    def testgetViewCopies(self):
+        a = self.pcset[:]
+        for b in (a.copy(), a + [3], a - [2], a.union([3]), a._transpose(1)):
+            self.assertEqual(b.__class__, PCSet)
+            self.assertEqual(b.storage(), 'list')
+        b = a.copy()
+        b.t(1)
+        self.assertEqual(b, [1, 2, 3, 5, 6, 8, 10, 0])
+        self.assertEqual(self.pcset, [0, 1, 2, 5, 7, 9, 11, 4])
+        b = self.pset[2:5] + [0]
+        b.t(1)
+        self.assertEqual(b, [1, 3, 5, 6])
+
+    def testgetToneRow(self):
+        row = ToneRow(list(range(0, 12)))
+        self.assertEqual(row[:], row)
+        self.assertRaises(row.IncompleteToneRow, row.__getitem__, slice(0, 3))
+
 
 class SequenceTest(TestCase):
     """PCSets and PSets behave like sequences with iteration and len()"""
@@ -374,6 +437,100 @@ class CopyTest(TestCase):
         b = a.copy()
         verify(b)
 
+    def testcopyIndependent(self):
+        a = PSet(self.l, ordered=True)
+        b = a.copy()
+        b[0] = 5
+        self.assertEqual(a.pitches, self.l)
+        self.assertEqual(b.pitches, [5, 3, 16, 1])
+        c = a._transpose(115)
+        self.assertEqual(c.pitches, [115, 118, 11, 116])
+        self.assertEqual(a._invert(-115).pitches, [-115, -118, -11, -116])
+
+
+class CachedViewTest(TestCase):
+    """Derived views are cached until the object changes"""
+
+    def setUp(self):
+        self.l = [7, 0, 16, 4]
+        self.pcset = PCSet(self.l)
+
+    def testViewsCached(self):
+        a = self.pcset
+        [pc for pc in a]
+        ppc = a._ppc
+        self.assertEqual(len(a), 3)
+        self.assertTrue(a._ppc is ppc)
+        self.assertTrue(a._pcs is a._pcs)
+
+    def testPublicViewsAreCopies(self):
+        a = self.pcset
+        a.ppc.append(11)
+        a.pcs.append(11)
+        a.uo_pcs.reverse()
+        self.assertEqual(a.ppc, [0, 4, 7])
+        self.assertEqual(a.uo_pcs, [0, 4, 4, 7])
+        a.pitches.append(2)
+        self.assertEqual(a.pitches, [7, 0, 16, 4])
+        self.assertEqual(a.ppc, [0, 4, 7])
+        self.assertEqual(a.setint, 145)
+
+    def testInvalidation(self):
+        a = self.pcset
+        self.assertEqual(a, [0, 4, 7])
+        a[0] = 9
+        self.assertEqual(a, [0, 4, 9])
+        a.mod(7)
+        self.assertEqual(a, [0, 2, 4])
+        a.ordered(True)
+        self.assertEqual(a.__repr__(), '[2, 0, 4]')
+        a.multiset(True)
+        self.assertEqual(a.__repr__(), '[2, 0, 2, 4]')
+        a.t(1)
+        self.assertEqual(a.__repr__(), '[3, 1, 3, 5]')
+
+    def testToneRowSwap(self):
+        row = ToneRow(list(range(0, 12)))
+        self.assertEqual(row.ppc[0], 0)
+        row.swap(0, 11)
+        self.assertEqual(row.ppc[0], 11)
+
+
+class LayoutTest(TestCase):
+    """Objects use a slotted layout and still pickle and copy"""
+
+    def setUp(self):
+        self.pcset = PCSet([0, 3, 16], mod=7, multiset=True)
+        self.pcset.canon(True, False, True)
+        self.pset = PSet([0, 3, 16], ordered=True)
+        self.tonerow = ToneRow(list(range(0, 12)))
+
+    def testNoDict(self):
+        for each in (self.pcset, self.pset, self.tonerow):
+            self.assertFalse(hasattr(each, '__dict__'))
+
+    def testFlags(self):
+        a = self.pcset
+        self.assertEqual((a._multiset, a._ordered), (True, False))
+        self.assertEqual(a.get_canon, (True, False, True))
+        a.ordered(True)
+        self.assertTrue(a._ordered and a._multiset)
+
+    def testPickle(self):
+        for each in (self.pcset, self.pset, self.tonerow):
+            for protocol in range(0, pickle.HIGHEST_PROTOCOL + 1):
+                new = pickle.loads(pickle.dumps(each, protocol))
+                self.assertEqual(new.__class__, each.__class__)
+                self.assertEqual(new.pitches, each.pitches)
+                self.assertEqual(new._flags, each._flags)
+                self.assertEqual(new.mod(), each.mod())
+
+    def testCopyModule(self):
+        for each in (self.pcset, self.pset, self.tonerow):
+            for new in (copy.copy(each), copy.deepcopy(each)):
+                self.assertEqual(new.pitches, each.pitches)
+                self.assertEqual(new._flags, each._flags)
+
 
 """Test settings attributes and their methods"""
 class SettingsTest(TestCase):
@@ -173,7 +173,7 @@ class VectorPropertyTest(TestCase):
 
     def testDS(self):
         self.assertEqual([tri.ds for tri in PCSet.each_prime_in_card_mod(3, 12)], [
-            2, 1, 1, 1, 1, 2, 1, 1, 2, 2, 1, 6
+            2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 1, 6
         ])
 
     def testMVector(self):
@@ -319,12 +319,14 @@ class EachTest(TestCase):
             [0, 1, 4],
             [0, 1, 5],
             [0, 1, 6],
+            [0, 1, 7],
             [0, 2, 4],
             [0, 2, 5],
             [0, 2, 6],
             [0, 2, 7],
             [0, 3, 6],
             [0, 3, 7],
+            [0, 3, 8],
             [0, 4, 8],
         ]
         for each in PCSet.each_prime_in_card_mod(3, 13):
@@ -3,67 +3,72 @@ from unittest import TestCase, main
 
 from sator.core import PCSet, PSet
 import sator.utils as utils
+import sator.tables as tables
 from sator.const import Z_PARTNERS
 
+def rotation_ints(pcset):
+    """
+    Returns a nested list of the integer representations of each canonical
+    TTO of a PCSet, found by performing each one, to check prime forms
+    against.
+    """
+    t, i, m = pcset.get_canon
+    if t:
+        rotations = [pcset.t_rotations]
+        if i:
+            rotations.append(pcset.i_rotations)
+        if m:
+            rotations.append(pcset.m_rotations)
+        if i and m:
+            rotations.append(pcset.mi_rotations)
+    else:
+        rotations = [[pcset]]
+        if i:
+            rotations.append([pcset._invert()])
+        if m:
+            rotations.append([pcset._transpose_multiply(0)])
+    return [[utils.setint(each._pcs) for each in rotation] \
+            for rotation in rotations]
+
+
 class PrimeTestCase(TestCase):        
     def setUp(self):
         self.l = [0, 1, 2, 3, 4, 6]
         self.set_ints = [0, 4095, 392, 661, 583, 203, 2741, 584, 394, 858]
         self.sets = [PCSet(utils.fromint(each)) for each in self.set_ints]
         self.pcset = PCSet(self.l)
-        self.t_rots = list(self.pcset._t_rotations())
-        self.i_rots = list(self.pcset._i_rotations())
-        self.m_rots = list(self.pcset._m_rotations())
-        self.mi_rots = list(self.pcset._mi_rotations())
+        self.t_rots = self.pcset.t_rotations
+        self.i_rots = self.pcset.i_rotations
+        self.m_rots = self.pcset.m_rotations
+        self.mi_rots = self.pcset.mi_rotations
 
 """Test prime and related subfunctions"""
 class PrimeAndRotationsTest(PrimeTestCase):
     """Methods that generate lists of PCSets after TnTm operations"""
 
-    def make_rotations(self):
-        """Helper for checking ._rotations and ._rotation_ints"""
-        self.t_only = [[self.pcset.uo_pcs]]
-        self.m_only = self.t_only + [[self.pcset._transpose_multiply().uo_pcs]]
-        self.i_only = self.t_only + [[self.pcset._invert().uo_pcs]]
-        self.im_only = self.t_only + [[self.pcset._invert().uo_pcs]] + \
-            [[self.pcset._transpose_multiply().uo_pcs]]
-        self.ti_rots = [self.t_rots] + [self.i_rots]
-        self.tm_rots = [self.t_rots] + [self.m_rots]
-        self.im_rots = [self.i_rots] + [self.m_rots]
-        self.all_rots = [self.t_rots] + [self.i_rots] + [self.m_rots] + \
-            [self.mi_rots]
-
     def make_canons(self):    
         for canon_t in [True, False]:
             for canon_i in [True, False]:
                 for canon_m in [True, False]:
                     yield canon_t, canon_i, canon_m
 
-    def make_rotation_ints(self):
-        """Helper for making setints from rotations"""
-        result = []
-        for rotation in self.pcset._rotations():
-            result.append([utils.setint(pcs) for pcs in rotation])
-        return result
-
     def make_prime_operation(self):
         """Helper for listing operations that make rotation_ints"""
         tto_ints = []
-        for index_m, operation in enumerate(self.pcset._rotation_ints):
+        for index_m, operation in enumerate(rotation_ints(self.pcset)):
             for index_t, num in enumerate(operation):
                 tto_ints.append((num, index_t, index_m))
         tto_ints.sort()
         tto = tto_ints[0]
-        oper = tto[2]
-        if oper == 0:
-            m = 1
-        elif oper == 1:
-            m = self.pcset._mod - 1
-        elif oper == 2:
-            m = self.pcset._default_m
-        elif oper == 3:
-            m = self.pcset._mod - self.pcset._default_m
-        return (tto[1], m)
+        canon_t, canon_i, canon_m = self.pcset.get_canon
+        operations = [1]
+        if canon_i:
+            operations.append(self.pcset._mod - 1)
+        if canon_m:
+            operations.append(self.pcset._default_m)
+            if canon_t and canon_i:
+                operations.append(self.pcset._mod - self.pcset._default_m)
+        return (tto[1], operations[tto[2]])
 
 
     def testT_rotations(self):
@@ -87,28 +92,6 @@ class PrimeAndRotationsTest(PrimeTestCase):
         all_rots = self.t_rots + self.i_rots + self.m_rots + self.mi_rots
         self.assertEqual(all_rots, self.pcset.all_rotations)
 
-    def testRotations(self):
-        self.make_rotations()
-        def unpack_rotations():
-            """unpack the generator of generators to a list of lists"""
-            return [list(rot) for rot in self.pcset._rotations()]
-        self.pcset.canon(True, True, True)
-        self.assertEqual(self.all_rots, unpack_rotations())
-        self.pcset.canon(True, True, False) # Default setting. Tn/TnI-type
-        self.assertEqual(self.ti_rots, unpack_rotations())
-        self.pcset.canon(True, False, True)
-        self.assertEqual(self.tm_rots, unpack_rotations())
-        self.pcset.canon(True, False, False)
-        self.assertEqual([self.t_rots], unpack_rotations())
-        self.pcset.canon(False, True, True)
-        self.assertEqual(self.im_only, unpack_rotations())
-        self.pcset.canon(False, True, False)
-        self.assertEqual(self.i_only, unpack_rotations())
-        self.pcset.canon(False, False, True)
-        self.assertEqual(self.m_only, unpack_rotations())
-        self.pcset.canon(False, False, False)
-        self.assertEqual(self.t_only, unpack_rotations())
-
     def testAllRotations(self):
         all_rots = []
         all_rots.extend(self.t_rots)
@@ -117,13 +100,6 @@ class PrimeAndRotationsTest(PrimeTestCase):
         all_rots.extend(self.mi_rots)
         self.assertEqual(all_rots, self.pcset.all_rotations)
 
-    def testRotationInts(self):
-        self.make_rotations()
-        for t, i, m in self.make_canons():
-            self.pcset.canon(t, i, m)
-            self.assertEqual(self.make_rotation_ints(),
-                             self.pcset._rotation_ints)
-
     def testPrimeOperation(self):
         self.pcset.clear()
         l = [3, 5, 6, 11, 0, -2, 2, -4, 7, 9, 13, -8]
@@ -153,8 +129,8 @@ class PrimeAndRotationsTest(PrimeTestCase):
                          [0, 1, 3, 7],
                          [],
                          [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
-                         [0, 6, 7, 9],
-                         [0, 1, 6, 10],
+                         [0, 1, 3, 6],
+                         [0, 1, 4, 6],
                          [],
                          [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
                          [0, 3, 5, 6],
@@ -222,6 +198,14 @@ class PrimeReliantTests(PrimeTestCase):
             self.assertEqual(each.literal_compliment.prime,
                              each.abstract_compliment)
 
+    def testAbstractComplimentCanon(self):
+        # The prime form of the complement follows the object's canonical
+        # operators, where it was once always Tn/TnI-type
+        a = PCSet(0, 1, 2, 4, 7)
+        self.assertEqual(a.abstract_compliment, [0, 1, 2, 3, 5, 6, 8])
+        a.canon(True, False, False)
+        self.assertEqual(a.abstract_compliment, [0, 2, 3, 5, 6, 7, 8])
+
     def testicv(self):
         icvs = [each.icv for each in self.sets]
         self.assertEqual(icvs, [
@@ -250,18 +234,168 @@ class PrimeReliantTests(PrimeTestCase):
             each.z()
             self.assertTrue(each.pcint in Z_PARTNERS.values())
 
+    def testZPartnerCanon(self):
+        # 6-Z6 and 6-Z38 are M-partners, so with M canonical they are one
+        # set-class and 6-Z6 has no Z-partner.
+        a = PCSet.fromint(231)
+        self.assertEqual(a.zpartner, [0, 1, 2, 3, 7, 8])
+        for canon in ((True, True, True), (True, False, True)):
+            a.canon(*canon)
+            self.assertEqual(a.zpartner, None)
+            self.assertEqual(a.zpartners, [])
+            a.z()
+            self.assertEqual(a.setint, 231)
+        a.canon(True, False, False)
+        self.assertEqual(a.zpartner, [0, 1, 2, 3, 7, 8])
+        # Without I, both Tn-types of the partner are Z-related, but the
+        # inversion of the set is not
+        b = PCSet(0, 1, 4, 6)
+        b.canon(True, False, False)
+        self.assertEqual(b.zpartners, [[0, 1, 3, 7], [0, 4, 6, 7]])
+
     def testZPartner_non_mod_12(self):
-        a = PCSet(3, 5, 8)
+        a = PCSet(0, 1, 4, 6)
         a.mod(13)
         b = a.zpartner
-        self.assertEqual(b, [0, 2, 10])
+        self.assertEqual(b, [0, 2, 3, 7])
+        self.assertEqual(b.prime, b)
         self.assertEqual(a.icv, b.icv)
+        self.assertNotEqual(a.prime, b.prime)
+        # Trichords with the same icv are always related by Tn/TnI in mod 13
+        c = PCSet(3, 5, 8)
+        c.mod(13)
+        self.assertEqual(c.zpartner, None)
+
+    def testZPartners(self):
+        self.assertEqual(PCSet(0, 1, 3, 7).zpartners, [[0, 1, 4, 6]])
+        self.assertEqual(PCSet(0, 1, 2).zpartners, [])
+        a = PCSet(0, 1, 3, 5, 7, 8, mod=16)
+        self.assertEqual(a.zpartners, [[0, 1, 2, 4, 6, 9], [0, 2, 3, 4, 6, 11]])
+        self.assertEqual(a.zpartner, [0, 1, 2, 4, 6, 9])
+        for each in a.zpartners:
+            self.assertEqual(each.icv, a.icv)
+            self.assertEqual(each.mod(), 16)
+            self.assertTrue(a.prime in each.zpartners)
+        # Inversions share an ICV, but are never Z-related
+        b = PCSet(0, 1, 3, mod=13)
+        b.canon(True, False, False)
+        self.assertEqual(b.zpartners, [])
+        b.canon_group([1], True)
+        self.assertEqual(b.zpartners, [])
 
     def testEachPrime(self):
         a = PCSet()
         for prime in a.each_prime():
             self.assertEqual(prime.prime, prime._unique_pcs)
 
+class PrimeFormTest(TestCase):
+    """The setint prime form engine in utils"""
+
+    def setUp(self):
+        self.mods = [5, 7, 12, 13]
+
+    def testRotate(self):
+        for mod in self.mods:
+            for integer in range(0, 2 ** mod, 7):
+                pcs = utils.fromint(integer)
+                for n in range(0, mod):
+                    self.assertEqual(utils.rotate(integer, n, mod),
+                        utils.setint(set([(pc + n) % mod for pc in pcs])))
+
+    def testInvertMultiply(self):
+        for mod in self.mods:
+            for integer in range(0, 2 ** mod, 7):
+                pcs = utils.fromint(integer)
+                self.assertEqual(utils.invert_int(integer, mod),
+                                 utils.setint(set([-pc % mod for pc in pcs])))
+                for m in range(0, mod):
+                    self.assertEqual(utils.multiply_int(integer, m, mod),
+                        utils.setint(set([pc * m % mod for pc in pcs])))
+
+    def testIcvInt(self):
+        for mod in self.mods + [1, 2, 6]:
+            for integer in range(0, 2 ** mod, 3):
+                pcs = utils.fromint(integer)
+                icv = [len([pc for pc in pcs if (pc + ic) % mod in pcs]) \
+                       for ic in range(0, mod // 2 + 1)]
+                if mod % 2 == 0:
+                    icv[-1] //= 2
+                self.assertEqual(utils.icv_int(integer, mod), icv)
+                self.assertEqual(utils.icv(pcs + [pc + mod for pc in pcs],
+                                           mod), icv)
+        self.assertEqual(utils.icv_int(utils.setint([0, 6])),
+                         [2, 0, 0, 0, 0, 0, 1])
+        self.assertTrue(isinstance(utils.icv_int(utils.setint([0, 6]))[6],
+                                   int))
+
+    def testPrimeForm(self):
+        canons = [(True, True, False), (True, True, True), (True, False, True),
+                  (False, True, False)]
+        for mod in self.mods:
+            for integer in range(0, 2 ** mod, 11):
+                a = PCSet(utils.fromint(integer), mod=mod)
+                for canon in canons:
+                    a.canon(*canon)
+                    prime, (n, m) = utils.prime_form(integer, mod, canon)
+                    low = min([min(rot) for rot in rotation_ints(a)])
+                    self.assertEqual(prime, low)
+                    self.assertEqual(a._transpose_multiply(n, m).setint, prime)
+                    self.assertEqual(a.pcint, prime)
+                    self.assertEqual(a.prime.mod(), mod)
+
+    def testTables(self):
+        for mod in self.mods:
+            for canon in [(True, True, False), (False, True, True)]:
+                primes, ns, ms = tables.prime_table(mod, canon)
+                self.assertEqual(len(primes), 2 ** mod)
+                for integer in range(0, 2 ** mod, 3):
+                    self.assertEqual(tables.prime_form(integer, mod, canon),
+                        utils.prime_form(integer, mod, canon))
+        self.assertTrue(tables.prime_table(7) is tables.prime_table(7))
+        integer = 2 ** 20 + 5
+        self.assertEqual(tables.prime_form(integer, 21),
+                         utils.prime_form(integer, 21))
+
+    def testNecklaces(self):
+        for mod in self.mods:
+            lowest = [integer for integer in range(0, 2 ** mod) \
+                      if utils.lowest_rotation(integer, mod) == integer]
+            self.assertEqual(list(utils.necklaces(mod)), lowest)
+            self.assertEqual(list(utils.necklaces(mod, 3)),
+                [integer for integer in lowest if utils.popcount(integer) == 3])
+
+    def testPrimes(self):
+        canons = [(True, True, False), (True, False, False), (True, True, True),
+                  (False, True, False)]
+        for mod in self.mods:
+            for canon in canons:
+                primes = [integer for integer in range(0, 2 ** mod) \
+                    if utils.prime_form(integer, mod, canon)[0] == integer]
+                self.assertEqual(list(utils.primes(mod, canon=canon)), primes)
+                self.assertEqual(list(utils.primes(mod, 4, canon)),
+                    [integer for integer in primes \
+                     if utils.popcount(integer) == 4])
+
+    def testEachPrimeCanon(self):
+        self.assertEqual(len(list(PCSet.each_prime_in_mod(12))), 224)
+        tn_types = list(PCSet.each_prime_in_mod(12, (True, False, False)))
+        self.assertEqual(len(tn_types), 352)
+        self.assertEqual(tn_types[0].get_canon, (True, False, False))
+        a = PCSet()
+        a.canon(True, True, True)
+        self.assertEqual(len(list(a.each_prime())), 158)
+        for each in PCSet.each_prime_in_card_mod(4, 12, (True, True, True)):
+            self.assertEqual(each.prime, each)
+            self.assertEqual(each.cardinality, 4)
+        pcints = [each.pcint for each in PCSet.each_prime_in_card_mod(5, 13)]
+        self.assertEqual(pcints, sorted(pcints))
+
+    def testAbstractComplimentMod(self):
+        a = PCSet(0, 1, 3, mod=7)
+        self.assertEqual(a.abstract_compliment.mod(), 7)
+        self.assertEqual(a.abstract_compliment, a.literal_compliment.prime)
+
+
 class SubsetsTest(TestCase):
 
     def setUp(self):
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+import random
+from array import array
+from unittest import TestCase, main
+
+from sator import sample, tables, groups
+import sator.utils as utils
+from sator.core import PCSet
+
+
+class SampleTest(TestCase):
+    """Random samples of set-classes and sets"""
+
+    def testSeed(self):
+        self.assertEqual(sample.primes(50, seed=1), sample.primes(50, seed=1))
+        self.assertEqual(sample.sets(50, seed=1), sample.sets(50, seed=1))
+        rng = random.Random(2)
+        first = sample.primes(10, seed=rng)
+        self.assertNotEqual(sample.primes(10, seed=rng), first)
+        self.assertEqual(sample.primes(10, seed=random.Random(2)), first)
+
+    def testArrays(self):
+        self.assertTrue(isinstance(sample.primes(3), array))
+        self.assertEqual(sample.primes(3).typecode, 'H')
+        self.assertEqual(len(sample.sets(7, 24)), 7)
+        self.assertEqual(sample.primes(0), array('H'))
+        integers = sample.primes(20, 70, card=2, seed=1)
+        self.assertTrue(max(integers) < 2 ** 70)
+
+    def testPrimes(self):
+        each_prime = set(tables.prime_ints(12))
+        integers = sample.primes(2000, seed=1)
+        self.assertTrue(set(integers) <= each_prime)
+        # Every set-class of the cardinality is drawn
+        integers = sample.primes(500, card=3, seed=1)
+        self.assertEqual(set(integers), set(tables.prime_ints(12, card=3)))
+        for integer in sample.primes(100, 12, (True, False, False), card=5,
+                                     weighted=True, seed=1):
+            self.assertEqual(utils.popcount(integer), 5)
+            self.assertEqual(
+                tables.prime_form(integer, 12, (True, False, False))[0],
+                integer)
+
+    def testWeighted(self):
+        # The chromatic trichord is in 12 sets, the augmented triad in 4
+        count = 6000
+        uniform = list(sample.primes(count, card=3, seed=1))
+        weighted = list(sample.primes(count, card=3, weighted=True, seed=1))
+        chromatic = utils.setint([0, 1, 2])
+        augmented = utils.setint([0, 4, 8])
+        self.assertTrue(abs(uniform.count(chromatic) -
+                            uniform.count(augmented)) < count // 40)
+        self.assertTrue(weighted.count(chromatic) >
+                        2 * weighted.count(augmented))
+
+    def testSets(self):
+        for integer in sample.sets(100, 10, card=4, seed=1):
+            self.assertEqual(utils.popcount(integer), 4)
+            self.assertTrue(integer < 2 ** 10)
+        self.assertTrue(len(set(sample.sets(100, 12, seed=1))) > 90)
+
+    def testObjects(self):
+        primes = PCSet.sample_primes_in_mod(20, 13, (True, False, False),
+                                            card=4, seed=1)
+        self.assertEqual(len(primes), 20)
+        for each in primes:
+            self.assertEqual(each.mod(), 13)
+            self.assertEqual(each.get_canon, (True, False, False))
+            self.assertEqual(each.prime, each)
+            self.assertEqual(each.cardinality, 4)
+        sets = PCSet.sample_sets_in_mod(5, 12, card=6, seed=1)
+        self.assertEqual([each.setint for each in sets],
+                         list(sample.sets(5, 12, card=6, seed=1)))
+        a = PCSet(0, 1, 3, mod=7)
+        self.assertEqual(a.sample_primes(5, seed=1),
+                         PCSet.sample_primes_in_mod(5, 7, seed=1))
+        a.canon_group([3])
+        group = groups.get(7, [3])
+        for each in a.sample_primes(20, weighted=True, seed=1):
+            self.assertEqual(each.canon_group(), group)
+            self.assertEqual(each.setint, group.prime_form(each.setint)[0])
+        self.assertEqual([each.setint for each in a.sample_primes(5, seed=1)],
+                         list(sample.group_primes(5, group, seed=1)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
 #!/usr/bin/env python
-from unittest import TestCase, main
+from unittest import TestCase, main, skipIf
 
 from sator.core import PCSet, PSet
 from sator.sim import *
+import sator.utils as utils
 
 class SimMZCTests(TestCase):        
     def setUp(self):
@@ -21,6 +22,16 @@ class SimMZCTests(TestCase):
         b = a.zpartner
         self.assertTrue(z(a, b))
 
+    def testZMultiplePartners(self):
+        a = PCSet([0, 1, 3, 5, 7, 8], mod=16)
+        b = PCSet([0, 2, 3, 4, 6, 11], mod=16)
+        self.assertTrue(z(a, b))
+        self.assertTrue(z(b, a))
+        self.assertFalse(z(a, a))
+        c = PCSet.fromint(231)
+        c.canon(True, True, True)
+        self.assertFalse(z(c, c))
+
     def testC(self):
         a = self.pcset
         b = a.abstract_compliment
@@ -41,6 +52,40 @@ class SimMZCTests(TestCase):
         b = self.pcset_z
         self.assertEqual(asim(a, b, rational=True), (9, 21))
 
+    def testICVs(self):
+        a = self.pcset.icv
+        b = self.pcset_z.icv
+        self.assertEqual(sim_icvs(a, b), 9)
+        self.assertEqual(asim_icvs(a, b, rational=True), (9, 21))
+        self.assertEqual(asim_icvs(a, b), 9 / 21)
+
+    def testICVBatch(self):
+        sets = [self.pcset, self.pcset_z, PCSet([0, 6]), PCSet()]
+        icvs = utils.icv_batch([each.setint for each in sets])
+        self.assertEqual([list(icv) for icv in icvs],
+                         [each.icv for each in sets])
+        if utils.numpy is None:
+            self.assertEqual(utils.icv_batch([]), [])
+
+    @skipIf(utils.numpy is None, 'numpy is not installed')
+    def testICVBatchNumpy(self):
+        numpy = utils.numpy
+        for mod in (5, 12, 13, 24, 64):
+            setints = numpy.array([0, 1, 3, 2 ** mod - 1, 2 ** (mod - 1) + 5,
+                                   1 + 2 ** (mod // 2)], dtype=numpy.uint64)
+            icvs = utils.icv_batch(setints, mod)
+            self.assertEqual(icvs.shape, (len(setints), mod // 2 + 1))
+            self.assertEqual(icvs.tolist(),
+                             [utils.icv_int(int(each), mod) \
+                              for each in setints])
+        sets = [self.pcset, self.pcset_z, PCSet([0, 1, 2, 3])]
+        icvs = utils.icv_batch(numpy.array([each.setint for each in sets]))
+        self.assertEqual(sim_icvs(icvs, numpy.array(self.pcset.icv)).tolist(),
+                         [sim(each, self.pcset) for each in sets])
+        sims, totals = asim_icvs(icvs, icvs[1], rational=True)
+        self.assertEqual(list(zip(sims.tolist(), totals.tolist())),
+                         [asim(each, self.pcset_z, True) for each in sets])
+
     def testcheckmod(self):
         a = self.pcset
         b = PCSet([0, 3], mod=7)
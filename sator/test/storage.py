@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+from array import array
+from unittest import TestCase, main
+
+from sator.core import PCSet, PSet, ToneRow
+import sator.utils as utils
+
+
+class BitmaskStorageTest(TestCase):
+    """PCSets with bitmask storage behave like those with list storage"""
+
+    def setUp(self):
+        self.l = [0, 4, 7, 16, -1]
+        self.a = PCSet(self.l, storage='bitmask')
+        self.b = PCSet(self.l)
+
+    def testInit(self):
+        self.assertEqual(self.a.storage(), 'bitmask')
+        self.assertEqual(self.a._pitches, utils.setint([0, 4, 7, 11]))
+        self.assertEqual(self.a.pitches, [0, 4, 7, 11])
+        self.assertEqual(self.a, self.b)
+
+    def testInvalidStorage(self):
+        self.assertRaises(PSet.InvalidStorage, PSet, self.l, storage='bitmask')
+        self.assertRaises(self.a.InvalidStorage, self.a.storage, 'tuple')
+
+    def testStorageSwitch(self):
+        self.b.storage('bitmask')
+        self.assertEqual(self.b._pitches, self.a._pitches)
+        self.b.storage('list')
+        self.assertEqual(self.b.pitches, [0, 4, 7, 11])
+
+    def testOrderedMultisetFallBack(self):
+        self.a.ordered(True)
+        self.assertEqual(self.a.storage(), 'list')
+        c = PCSet(self.l, storage='bitmask')
+        c.multiset(True)
+        self.assertEqual(c.storage(), 'list')
+
+    def testMembership(self):
+        self.assertTrue(4 in self.a and 11 in self.a)
+        self.assertFalse(5 in self.a or 16 in self.a or -1 in self.a)
+
+    def testCardinality(self):
+        self.assertEqual(self.a.cardinality, self.b.cardinality)
+
+    def testSetInt(self):
+        self.assertEqual(self.a.setint, self.b.setint)
+
+    def testCompliment(self):
+        comp = self.a.literal_compliment
+        self.assertEqual(comp.storage(), 'bitmask')
+        self.assertEqual(comp, self.b.literal_compliment)
+
+    def testSetOperations(self):
+        c = PCSet([4, 5, 11], storage='bitmask')
+        for op in ('union', 'intersection', 'difference',
+                   'symmetric_difference'):
+            self.assertEqual(getattr(self.a, op)(c), getattr(self.b, op)(c))
+            self.assertEqual(getattr(self.a, op)([4, 5, 11]),
+                             getattr(self.b, op)([4, 5, 11]))
+        self.assertTrue(self.a.issuperset(PCSet(0, 4, storage='bitmask')))
+        self.assertTrue(self.a.issubset(list(range(0, 12))))
+        self.assertTrue(self.a.isdisjoint([1, 2]))
+        self.assertFalse(self.a.isdisjoint(c))
+
+    def testSetOperationsStayBitmasks(self):
+        # Bitmask arguments are combined as integers without decoding them
+        c = PCSet([4, 5, 11], storage='bitmask')
+        for op in ('union', 'intersection', 'difference',
+                   'symmetric_difference', 'issubset', 'isdisjoint'):
+            getattr(self.a, op)(c)
+        self.assertEqual(c._cache, None)
+        self.assertEqual(self.a._cache, None)
+
+    def testTTOs(self):
+        self.a.t(1)
+        self.b.t(1)
+        self.assertEqual(self.a, self.b)
+        self.assertEqual(self.a.prime, self.b.prime)
+        self.assertEqual(self.a.icv, self.b.icv)
+
+    def testMod(self):
+        # Bitmasks only store pcs, so compare against a set without octaves
+        b = PCSet(self.a.pitches)
+        self.a.mod(7)
+        b.mod(7)
+        self.assertEqual(self.a, b)
+        self.assertEqual(self.a.setint, b.setint)
+
+
+class ArrayStorageTest(TestCase):
+    """PSets and ToneRows with array storage behave like those with lists"""
+
+    def setUp(self):
+        self.l = [0, 16, -5, 7]
+        self.a = PSet(self.l, storage='array')
+        self.b = PSet(self.l)
+        self.row = ToneRow([0, 4, 5, 8, 9, 1, 10, 3, 6, 2, 7, 11],
+                           storage='array')
+
+    def testInit(self):
+        self.assertEqual(self.a.storage(), 'array')
+        self.assertEqual(self.a._pitches, array('h', self.l))
+        self.assertEqual(self.a.pitches, self.l)
+        self.assertEqual(self.a, self.b)
+        self.assertEqual(PSet(array('h', self.l)).pitches, self.l)
+
+    def testInvalidStorage(self):
+        self.assertRaises(PCSet.InvalidStorage, PCSet, self.l, storage='array')
+
+    def testBuffer(self):
+        buf = self.a.buffer
+        self.assertEqual(buf.format, 'h')
+        self.assertEqual(buf.tolist(), self.l)
+        self.assertTrue(buf.readonly)
+        self.assertEqual(self.b.buffer.tolist(), self.l)
+        self.assertEqual(self.row.buffer.tolist(), self.row.pitches)
+
+    def testChanges(self):
+        buf = self.a.buffer
+        for each in (self.a, self.b):
+            each.t(2)
+            each[0] = 1
+            each.insert(0, 3)
+        self.assertEqual(self.a, self.b)
+        self.assertEqual(self.a.storage(), 'array')
+        self.assertEqual(buf.tolist(), self.l)
+        self.assertEqual(self.a.buffer.tolist(), self.b.pitches)
+
+    def testCopy(self):
+        c = self.a.copy()
+        self.assertEqual(c.storage(), 'array')
+        self.assertFalse(c._pitches is self.a._pitches)
+        self.assertEqual(self.row.P.storage(), 'array')
+        self.assertEqual(self.row.RI, ToneRow(self.row).RI)
+
+    def testStorageSwitch(self):
+        self.a.storage('list')
+        self.assertEqual(self.a._pitches, self.l)
+        self.b.storage('array')
+        self.assertEqual(self.b._pitches, array('h', self.l))
+
+    def testTransformArrays(self):
+        pitches = array('h', self.l)
+        self.assertEqual(utils.transpose(pitches, 2),
+                         array('h', [2, 18, -3, 9]))
+        self.assertEqual(utils.invert(pitches), array('h', [0, -16, 5, -7]))
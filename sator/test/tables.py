@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+
+import sator.tables as tables
+import sator.utils as utils
+from sator.cache import LRUCache
+from sator.core import PCSet
+
+
+class TableFileTest(TestCase):
+    """Tables written to the cache directory are read back through mmap"""
+
+    def setUp(self):
+        self.old_dir = tables.cache_dir()
+        self.dir = tempfile.mkdtemp()
+        tables.cache_dir(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        tables.cache_dir(self.old_dir)
+        shutil.rmtree(self.dir)
+
+    def testSaveLoad(self):
+        self.assertEqual(tables.load(7), None)
+        path = tables.save(7)
+        self.assertTrue(os.path.exists(path))
+        primes, ns, ms = tables.load(7)
+        self.assertTrue(isinstance(primes, memoryview))
+        built = tables._build(7, (True, True, False), 5)
+        self.assertEqual(list(primes), list(built[0]))
+        self.assertEqual(list(ns), list(built[1]))
+        self.assertEqual(list(ms), list(built[2]))
+        self.assertTrue(isinstance(tables.prime_table(7)[0], memoryview))
+
+    def testFilenames(self):
+        self.assertNotEqual(tables.filename(7), tables.filename(7, default_m=3))
+        self.assertNotEqual(tables.filename(7),
+                            tables.filename(7, (True, True, True)))
+        self.assertTrue(tables.filename(7).endswith(
+            '.v{0}.bin'.format(tables.VERSION)))
+
+    def testInvalidFile(self):
+        path = tables.save(5)
+        with open(path, 'r+b') as table_file:
+            table_file.write(b'JUNK')
+        self.assertEqual(tables.load(5), None)
+        with open(path, 'wb') as table_file:
+            table_file.write(b'SATR')
+        self.assertEqual(tables.load(5), None)
+        self.assertEqual(tables.prime_form(11, 5), utils.prime_form(11, 5))
+
+    def testLargeModulus(self):
+        mod = tables.MAX_MOD + 1
+        self.assertEqual(tables._table(mod, (True, True, False), 5), None)
+        self.assertEqual(tables.prime_table(mod), None)
+        a = PCSet(0, 1, 5, 9, mod=mod)
+        self.assertEqual(a.pcint, utils.prime_form(a.setint, mod)[0])
+        tables.save(mod)
+        self.assertTrue(tables._table(mod, (True, True, False), 5) is not None)
+        self.assertTrue(tables.prime_table(mod) is not None)
+        self.assertEqual(a.prime_operation, utils.prime_form(a.setint, mod)[1])
+
+    def testBuild(self):
+        paths = tables.build(range(3, 6), (True, False, False))
+        self.assertEqual(len(paths), 3)
+        for mod, path in zip(range(3, 6), paths):
+            self.assertEqual(path, tables.filename(mod, (True, False, False)))
+            for integer in range(0, 2 ** mod):
+                self.assertEqual(
+                    tables.prime_form(integer, mod, (True, False, False)),
+                    utils.prime_form(integer, mod, (True, False, False)))
+
+
+class OrdinalTest(TestCase):
+    """Generated card-index names from ordinal tables"""
+
+    def setUp(self):
+        self.old_dir = tables.cache_dir()
+        self.dir = tempfile.mkdtemp()
+        tables.cache_dir(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        tables.cache_dir(self.old_dir)
+        shutil.rmtree(self.dir)
+
+    def testOrdinals(self):
+        for canon in ((True, True, False), (True, False, False)):
+            for card in range(0, 9):
+                for index, prime in enumerate(tables.prime_ints(8, canon,
+                                                                card=card)):
+                    self.assertEqual(tables.ordinal(prime, 8, canon), index + 1)
+                    name = '{0}-{1}'.format(card, index + 1)
+                    self.assertEqual(tables.forte_name(prime, 8, canon), name)
+                    self.assertEqual(tables.from_forte_name(name, 8, canon),
+                                     prime)
+        self.assertEqual(tables.ordinal(utils.setint([3, 4, 6]), 8),
+                         tables.ordinal(utils.setint([0, 1, 3]), 8))
+        for name in ('3-99', '9-1', '3-0', 'x', None):
+            self.assertEqual(tables.from_forte_name(name, 8), None)
+
+    def testSaveLoad(self):
+        self.assertEqual(tables.load_ordinals(7), None)
+        path = tables.save_ordinals(7)
+        self.assertEqual(path, tables.filename(7, kind='ordinals'))
+        self.assertNotEqual(path, tables.filename(7))
+        ordinals = tables.load_ordinals(7)
+        self.assertTrue(isinstance(ordinals, memoryview))
+        self.assertEqual(list(ordinals),
+                         list(tables._build_ordinals(7, (True, True, False), 5)))
+        # A prime table file is not read as an ordinal table
+        os.rename(tables.save(7), path)
+        self.assertEqual(tables.load_ordinals(7), None)
+
+    def testLargeModulus(self):
+        mod = tables.MAX_MOD + 1
+        a = PCSet(0, 1, 5, 9, mod=mod)
+        index = tables.prime_ints(mod, card=4).index(a.pcint) + 1
+        self.assertEqual(a.forte, '4-{0}'.format(index))
+        tables.build([mod])
+        self.assertTrue(tables._ordinal_table(mod, (True, True, False), 5)
+                        is not None)
+        self.assertEqual(a.forte, '4-{0}'.format(index))
+        self.assertEqual(PCSet.forte_name(a.forte, mod), a.prime)
+
+    def testForte(self):
+        self.assertEqual(PCSet(0, 1, 4, 6).forte, '4-Z15')
+        names = [each.forte for each in PCSet.each_prime_in_card_mod(3, 7)]
+        self.assertEqual(names, ['3-1', '3-2', '3-3', '3-4'])
+        a = PCSet(0, 1, 3, 7, mod=24)
+        self.assertEqual(PCSet.forte_name(a.forte, 24), a.prime)
+        self.assertEqual(PCSet.forte_name('4-9999', 24), PCSet(mod=24))
+        a.canon_group([7])
+        primes = list(a.canon_group().primes(4))
+        self.assertEqual(a.forte, '4-{0}'.format(primes.index(a.pcint) + 1))
+
+
+class OrderingTest(TestCase):
+    """Prime forms chosen by Forte's or Rahn's rule"""
+
+    def setUp(self):
+        self.old_dir = tables.cache_dir()
+        self.dir = tempfile.mkdtemp()
+        tables.cache_dir(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        tables.ordering('setint')
+        tables.ORDERINGS.pop('highest', None)
+        tables.cache_dir(self.old_dir)
+        shutil.rmtree(self.dir)
+
+    def testForte(self):
+        setint_primes = tables.prime_ints(12)
+        tables.ordering('forte')
+        self.assertEqual(tables.ordering(), 'forte')
+        forte_primes = tables.prime_ints(12)
+        self.assertEqual(len(forte_primes), 224)
+        changed = sorted([PCSet.fromint(integer).forte \
+                          for integer in set(forte_primes) - \
+                          set(setint_primes)])
+        self.assertEqual(changed, ['5-20', '6-31', '6-Z29', '7-20', '7-Z18',
+                                   '8-26'])
+        a = PCSet(0, 1, 5, 6, 8)
+        self.assertEqual(a.prime, [0, 1, 3, 7, 8])
+        self.assertEqual(a.forte, '5-20')
+        self.assertEqual(a.copy(utils.transpose_multiply(a.pcs,
+                                                         *a.prime_operation)),
+                         a.prime)
+        self.assertEqual(PCSet.forte_name('5-20'), [0, 1, 3, 7, 8])
+        self.assertEqual(PCSet(0, 1, 4, 6, 7, 9).zpartner, [0, 1, 3, 6, 8, 9])
+        for integer in range(0, 4096, 7):
+            self.assertEqual(tables.prime_form(integer, 12),
+                utils.prime_form(integer, 12, key=utils.forte_key))
+        # Without Tn, orderings have no effect
+        b = PCSet(0, 1, 5, 6, 8)
+        b.canon(False, True, False)
+        self.assertEqual(b.prime, [0, 1, 5, 6, 8])
+
+    def testSetintLookup(self):
+        tables.ordering('forte')
+        # The Forte names of mod 12 are looked up in the setint table rather
+        # than brute forced for each set
+        self.assertEqual(PCSet(0, 1, 5, 6, 8).forte, '5-20')
+        self.assertTrue(tables._cache_key(12, (True, True, False), 5,
+                                          'setint') in tables._tables)
+        for integer in range(0, 4096, 7):
+            self.assertEqual(tables.prime_form(integer, 12, ordering='setint'),
+                             utils.prime_form(integer, 12))
+        self.assertEqual(tables.ordering(), 'forte')
+
+    def testRahn(self):
+        # Rahn's rule packs to the right: the lowest highest pc, then the
+        # lowest second highest, and so on.
+        def rahn_key(integer, mod):
+            if not integer & 1:
+                return (mod + 1,)
+            return tuple(reversed(utils.fromint(integer)))
+        tables.register_ordering('highest', rahn_key)
+        tables.ordering('highest')
+        rahn_primes = tables.prime_ints(12)
+        tables.ordering('rahn')
+        self.assertEqual(tables.prime_ints(12), rahn_primes)
+        tables.ordering('setint')
+        self.assertEqual(tables.prime_ints(12), rahn_primes)
+
+    def testTables(self):
+        tables.ordering('forte')
+        path = tables.save(8)
+        self.assertNotEqual(path, tables.filename(8, (True, False, False)))
+        tables.ordering('rahn')
+        self.assertNotEqual(path, tables.filename(8))
+        tables.ordering('forte')
+        self.assertEqual(path, tables.filename(8))
+        tables.clear()
+        self.assertTrue(isinstance(tables.prime_table(8)[0], memoryview))
+        for integer in range(0, 256):
+            self.assertEqual(tables.prime_form(integer, 8),
+                utils.prime_form(integer, 8, key=utils.forte_key))
+        for card in range(0, 9):
+            for index, prime in enumerate(tables.prime_ints(8, card=card)):
+                self.assertEqual(tables.ordinal(prime, 8), index + 1)
+        mod = tables.MAX_MOD + 1
+        a = PCSet(0, 1, 5, 6, 8, mod=mod)
+        self.assertEqual(a.pcint, utils.prime_form(a.setint, mod,
+                                                   key=utils.forte_key)[0])
+
+    def testInvalid(self):
+        self.assertRaises(tables.InvalidOrdering, tables.ordering, 'morris')
+        self.assertEqual(tables.ordering(), 'setint')
+
+
+class ResultCacheTest(TestCase):
+    """Results for moduli without tables are kept in an LRU cache"""
+
+    def setUp(self):
+        self.old_size = tables.cache_size()
+        tables.clear()
+
+    def tearDown(self):
+        tables.cache_size(self.old_size)
+        tables.clear()
+
+    def testLRUCache(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertFalse('b' in cache)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.info(),
+                         {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2})
+        cache.maxsize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertTrue('c' in cache)
+
+    def testCanonKeys(self):
+        mod = tables.MAX_MOD + 3
+        a = PCSet(0, 2, 3, mod=mod)
+        b = a.copy()
+        b.canon(True, False, False)
+        for each in (a, b, a, b):
+            each.pcint
+        info = tables.cache_info()
+        self.assertEqual((info['hits'], info['misses']), (2, 2))
+        self.assertNotEqual(a.pcint, b.pcint)
+        tables.cache_size(1)
+        a.prime_operation
+        b.prime_operation
+        self.assertEqual(tables.cache_info()['size'], 1)
+
+    def testPrimeInts(self):
+        ints = tables.prime_ints(12)
+        self.assertEqual(len(ints), 224)
+        self.assertTrue(tables.prime_ints(12) is ints)
+        self.assertEqual(len(tables.prime_ints(12, (True, False, False))), 352)
+        self.assertEqual([each.pcint for each in PCSet.each_prime_in_mod(12)],
+                         list(ints))
+
+    def testModResultsKept(self):
+        # Per-set lookups do not evict the results for a whole modulus
+        tables.cache_size(2)
+        ints = tables.prime_ints(12)
+        index = tables.icv_index(12)
+        mod = tables.MAX_MOD + 3
+        for integer in range(0, 10):
+            tables.prime_form(integer, mod)
+        self.assertEqual(tables.cache_info()['size'], 2)
+        self.assertTrue(tables.prime_ints(12) is ints)
+        self.assertTrue(tables.icv_index(12) is index)
@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 
-from sator.setrowbase import SetRowBase, PCBase
+from sator.setrowbase import SetRowBase, PCBase, ORDERED
 
 class ToneRow(SetRowBase, PCBase):
+    __slots__ = ()
+
     _modulus = 12
+    _default_flags = ORDERED
+    _storage_types = ('list', 'array')
 
     class IncompleteToneRow(Exception):
         pass
@@ -11,19 +15,34 @@ class ToneRow(SetRowBase, PCBase):
     def __init__(self, *args, **kwargs):
         kwargs.update({'multiset': False, 'ordered': True})
         SetRowBase.__init__(self, *args, **kwargs)
-        if len(self.ppc) < self._mod:
+        self._check_complete()
+
+    def _check_complete(self):
+        if len(self._ppc) < self._mod:
             msg = 'Tone rows must be instantiated with a number of ' + \
                   'pitches or pcs equal to their modulus'
             raise self.IncompleteToneRow(msg)
 
+    def __getitem__(self, key):
+        new = SetRowBase.__getitem__(self, key)
+        new._check_complete()
+        return new
+    __getitem__.__doc__ = SetRowBase.__getitem__.__doc__
+
+    def _new(self, pitches):
+        new = SetRowBase._new(self, pitches)
+        new._check_complete()
+        return new
+    _new.__doc__ = SetRowBase._new.__doc__
+
     def swap(self, a, b):
         """
         Given two arguments, swap the PC's in the ToneRow that are at these
         positions. 
         """
-        c = self.pitches[a]
-        self.pitches[a] = self.pitches[b]
-        self.pitches[b] = c
+        pitches = self.pitches
+        pitches[a], pitches[b] = pitches[b], pitches[a]
+        self.pitches = pitches
 
     @property
     def P(self):
@@ -33,7 +52,7 @@ class ToneRow(SetRowBase, PCBase):
     @property
     def R(self):
         """Returns the retrograde of the ToneRow"""
-        return self.copy(list(reversed(self.ppc)))
+        return self.copy(list(reversed(self._ppc)))
 
     @property
     def I(self):
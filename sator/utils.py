@@ -1,7 +1,14 @@
 #!/usr/bin/env python
 from __future__ import division
+from array import array
+
 from sator.const import FORTE_NAMES, FORTE_INTS
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 # Force Python 2.X to use xrange
 try:
@@ -10,10 +17,17 @@ except:
     pass
 
 
+def _is_ndarray(pitches):
+    return numpy is not None and isinstance(pitches, numpy.ndarray)
+
 def transpose(pitches, sub_n=0):
     """
     Given a list of pitches and n, returns an object of the same type after Tn
     """
+    if _is_ndarray(pitches):
+        return pitches + sub_n
+    if isinstance(pitches, array):
+        return array(pitches.typecode, [pitch + sub_n for pitch in pitches])
     return [pitch + sub_n for pitch in pitches]
 
 def invert(pitches, sub_n=0):
@@ -28,6 +42,10 @@ def multiply(pitches, sub_m):
     Given an object and n, returns an object of the same type after TnMm,
     where m is required. (For mod 12, m is usually 5.)
     """
+    if _is_ndarray(pitches):
+        return pitches * sub_m
+    if isinstance(pitches, array):
+        return array(pitches.typecode, [pitch * sub_m for pitch in pitches])
     return [pitch * sub_m for pitch in pitches]
 
 def transpose_multiply(pitches, sub_n, sub_m):
@@ -42,6 +60,197 @@ def setint(pcs):
     """Find the integer representation of an unordered PC set"""
     return sum([2 ** pc for pc in pcs])
 
+def gcd(a, b):
+    """Returns the greatest common divisor of two integers"""
+    while b:
+        a, b = b, a % b
+    return abs(a)
+
+def popcount(integer):
+    """Count the members of a PC set from its integer representation"""
+    return bin(integer).count('1')
+
+def rotate(integer, sub_n, mod=12):
+    """
+    Given the integer representation of a PC set, returns the integer
+    representation of the set after Tn, which is a cyclic rotation of its bits
+    """
+    sub_n %= mod
+    return ((integer << sub_n) | (integer >> (mod - sub_n))) & ((1 << mod) - 1)
+
+def reverse(integer, mod=12):
+    """
+    Given the integer representation of a PC set, returns the integer
+    representation with its bits in reverse order, i.e. the set after T(mod-1)I
+    """
+    return int(format(integer, '0{0}b'.format(mod))[::-1], 2)
+
+def invert_int(integer, mod=12):
+    """
+    Given the integer representation of a PC set, returns the integer
+    representation of the set after T0I
+    """
+    return rotate(reverse(integer, mod), 1, mod)
+
+_multiply_tables = {}
+
+def _multiply_table(sub_m, mod):
+    """
+    Returns a table for multiplying integer representations by m, with one
+    list for each byte of the integer, which maps that byte to the bits of the
+    pc's it holds after Mm
+    """
+    key = (sub_m % mod, mod)
+    table = _multiply_tables.get(key)
+    if table is None:
+        table = []
+        for offset in range(0, mod, 8):
+            pcs = [pc for pc in range(offset, min(offset + 8, mod))]
+            byte_table = []
+            for byte in range(0, 256):
+                bits = 0
+                for index, pc in enumerate(pcs):
+                    if byte >> index & 1:
+                        bits |= 1 << (pc * sub_m % mod)
+                byte_table.append(bits)
+            table.append(byte_table)
+        _multiply_tables[key] = table
+    return table
+
+def multiply_int(integer, sub_m, mod=12):
+    """
+    Given the integer representation of a PC set and m, returns the integer
+    representation of the set after T0Mm
+    """
+    if sub_m % mod == 1:
+        return integer
+    if sub_m % mod == mod - 1:
+        return invert_int(integer, mod)
+    result = 0
+    for byte_table in _multiply_table(sub_m, mod):
+        result |= byte_table[integer & 255]
+        integer >>= 8
+    return result
+
+def canonical_operations(mod=12, canon=(True, True, False), default_m=5):
+    """
+    Given a modulus, canonical operators (T, I, M) and default m, returns the
+    list of m's for the operations (T, I, M, MI) used to find prime forms.
+    MI is only included when T, I and M are all canonical.
+    """
+    canon_t, canon_i, canon_m = canon
+    operations = [1]
+    if canon_i:
+        operations.append(mod - 1)
+    if canon_m:
+        operations.append(default_m)
+        if canon_t and canon_i:
+            operations.append(mod - default_m)
+    return operations
+
+def is_group(mod, multipliers):
+    """
+    Returns True if a list of multipliers are all units of a modulus and are
+    closed under multiplication, so that the TnMm operations they give form a
+    group.
+    """
+    residues = set([sub_m % mod for sub_m in multipliers])
+    return all([gcd(sub_m, mod) == 1 for sub_m in residues]) and \
+        all([a * b % mod in residues for a in residues for b in residues])
+
+def prime_form(integer, mod=12, canon=(True, True, False), default_m=5,
+               key=None):
+    """
+    Given the integer representation of a PC set, its modulus, canonical
+    operators (T, I, M) and default m, returns (prime, (n, m)), where prime is
+    the integer representation of the set's prime form, which is reached via
+    TnMm. The prime form is the operation with the lowest integer, then the
+    lowest n, then the first of T, I, M and MI. If a key function is given
+    (such as forte_key), the lowest key(integer, mod) is used in place of the
+    lowest integer.
+    """
+    each_n = range(0, mod) if canon[0] else (0,)
+    best = None
+    for sub_m in canonical_operations(mod, canon, default_m):
+        multiplied = multiply_int(integer, sub_m, mod)
+        for sub_n in each_n:
+            value = rotate(multiplied, sub_n, mod)
+            rank = value if key is None else key(value, mod)
+            if best is None or (rank, sub_n) < best[:2]:
+                best = (rank, sub_n, sub_m, value)
+    return best[3], (best[1], best[2])
+
+def forte_key(integer, mod=12):
+    """
+    Given the integer representation of a PC set, returns a key which orders
+    sets by Forte's rule for prime forms: sets including pc 0 come first,
+    by their highest pc (the span), then packed to the left, by their
+    second lowest pc, then their third lowest and so on. The lowest integer
+    orders them by their span and then packed to the right, which is Rahn's
+    rule.
+    """
+    if not integer & 1:
+        return (mod + 1,)
+    pcs = fromint(integer)
+    return (pcs[-1],) + tuple(pcs[1:-1])
+
+def necklaces(mod=12, card=None):
+    """
+    Yields the integer representation of each PC set in a modulus that is the
+    lowest of its transpositions (its Tn-type prime form), in ascending
+    order, optionally only those with a given cardinality. Uses the
+    Fredricksen-Kessler-Maiorana algorithm on the bits of the integer from
+    the highest down, which takes constant amortized time per set.
+    """
+    bits = [0] * (mod + 1)
+
+    def extend(t, p, integer, ones):
+        if card is not None and (ones > card or ones + mod - t + 1 < card):
+            return
+        if t > mod:
+            if mod % p == 0:
+                yield integer
+            return
+        for bit in range(bits[t - p], 2):
+            bits[t] = bit
+            for each in extend(t + 1, p if bit == bits[t - p] else t,
+                               integer | bit << (mod - t), ones + bit):
+                yield each
+
+    return extend(1, 1, 0, 0)
+
+def lowest_rotation(integer, mod=12):
+    """
+    Given the integer representation of a PC set, returns the lowest integer
+    representation of its transpositions
+    """
+    return min([rotate(integer, sub_n, mod) for sub_n in range(0, mod)])
+
+def primes(mod=12, card=None, canon=(True, True, False), default_m=5):
+    """
+    Yields the integer representation of each prime form in a modulus in
+    ascending order, optionally only those with a given cardinality, for the
+    given canonical operators (T, I, M) and default m. When T is canonical,
+    only the Tn-type primes given by necklaces() are checked against the
+    other operators.
+    """
+    operations = canonical_operations(mod, canon, default_m)[1:]
+    if not canon[0]:
+        integers = range(0, 2 ** mod) if card is None else \
+            (integer for integer in range(0, 2 ** mod) \
+             if popcount(integer) == card)
+        for integer in integers:
+            if prime_form(integer, mod, canon, default_m)[0] == integer:
+                yield integer
+        return
+    for integer in necklaces(mod, card):
+        for sub_m in operations:
+            multiplied = multiply_int(integer, sub_m, mod)
+            if lowest_rotation(multiplied, mod) < integer:
+                break
+        else:
+            yield integer
+
 def fromint(integer):
         result = []
         limit = len(bin(integer)) - 2
@@ -65,18 +274,68 @@ def from_forte(fname):
     except:
         return None
 
-def icv(pcs, mod=12):
-    icv_length = (mod // 2) + 1;
-    result = [0 for num in range(0, icv_length)]
-    icvs = range(0, icv_length)
-    for pc in pcs:
-        for cv in icvs:
-            if (pc + cv) % mod in pcs:
-                result[cv] += 1
-    if icv_length - 1 == mod / 2.0:
-        result[icv_length - 1] = result[icv_length - 1] / 2
+def icv_int(integer, mod=12):
+    """
+    Given the integer representation of a PC set, returns its interval class
+    vector, including interval class 0 (the cardinality). The set shares
+    popcount(integer & rotate(integer, k)) pairs of pc's k semitones apart,
+    which counts each tritone twice in even moduli.
+    """
+    result = [popcount(integer & rotate(integer, sub_n, mod)) \
+              for sub_n in range(0, mod // 2 + 1)]
+    if mod % 2 == 0:
+        result[-1] //= 2
+    return result
+
+def _popcount_array(integers):
+    """Counts the bits of each item of a numpy array of uint64's"""
+    if hasattr(numpy, 'bitwise_count'):
+        return numpy.bitwise_count(integers)
+    # Count the bits of each pair, nibble and byte, then add up the bytes
+    one = numpy.uint64(1)
+    integers = integers - ((integers >> one) & numpy.uint64(0x5555555555555555))
+    integers = (integers & numpy.uint64(0x3333333333333333)) + \
+        ((integers >> numpy.uint64(2)) & numpy.uint64(0x3333333333333333))
+    integers = (integers + (integers >> numpy.uint64(4))) & \
+        numpy.uint64(0x0f0f0f0f0f0f0f0f)
+    return (integers * numpy.uint64(0x0101010101010101)) >> numpy.uint64(56)
+
+def icv_batch(setints, mod=12):
+    """
+    Given a sequence of integer representations of PC sets, such as a numpy
+    array, returns a numpy array of shape (N, mod // 2 + 1) holding the
+    interval class vector of each, as icv_int does. The bits of every set
+    are rotated and counted at once, one interval class at a time, so there
+    is no Python loop over the sets for moduli up to 64. Without numpy,
+    returns a list of lists.
+    """
+    if numpy is None:
+        return [icv_int(int(integer), mod) for integer in setints]
+    if mod > 64:
+        return numpy.array([icv_int(int(integer), mod) \
+                            for integer in setints], dtype=numpy.int64) \
+            .reshape(-1, mod // 2 + 1)
+    integers = numpy.asarray(setints).astype(numpy.uint64).reshape(-1)
+    mask = numpy.uint64((1 << mod) - 1)
+    columns = []
+    for sub_n in range(0, mod // 2 + 1):
+        rotated = integers
+        if sub_n:
+            rotated = ((integers << numpy.uint64(sub_n)) |
+                       (integers >> numpy.uint64(mod - sub_n))) & mask
+        columns.append(_popcount_array(integers & rotated))
+    result = numpy.stack(columns, axis=-1).astype(numpy.int64)
+    if mod % 2 == 0:
+        result[:, -1] //= 2
     return result
 
+def icv(pcs, mod=12):
+    """
+    Given a list of pc's, returns the interval class vector of the set they
+    make (see icv_int)
+    """
+    return icv_int(setint(set([pc % mod for pc in pcs])), mod)
+
 def _supers_n_plus_1(pcs, mod):
     for index in range(0, mod):
         if index not in pcs: